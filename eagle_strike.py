@@ -1,10 +1,25 @@
 import pygame
+import numpy as np
 import random
 import os
 import datetime
 import sys
 import math
 import webbrowser
+import time
+import queue
+import threading
+import atexit
+import collections
+import heapq
+import bisect
+import argparse
+import json
+import traceback
+import hashlib
+import io
+import mmap
+from concurrent.futures import ThreadPoolExecutor
 
 def resource_path(relative_path):
     try:
@@ -12,42 +27,254 @@ def resource_path(relative_path):
     except AttributeError:
         base_path = os.path.abspath(".")
     full_path = os.path.join(base_path, relative_path)
-    log(f"Loading resource: {full_path}")
+    log(f"Loading resource: {full_path}", LOG_DEBUG)
     return full_path
 
+LOG_DEBUG = 10
+LOG_INFO = 20
+LOG_WARNING = 30
+LOG_ERROR = 40
+LOG_LEVEL_NAMES = {LOG_DEBUG: "DEBUG", LOG_INFO: "INFO", LOG_WARNING: "WARNING", LOG_ERROR: "ERROR"}
 log_file = os.path.join(os.path.abspath("."), "eagle_strike_log.txt")
-def log(message):
-    with open(log_file, "a") as f:
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        f.write(f"[{timestamp}] {message}\n")
-
-log("Starting Eagle Strike...")
-
-try:
-    pygame.init()
-except Exception as e:
-    log(f"Pygame initialization failed: {e}")
-    raise
-
-try:
-    pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
-    pygame.mixer.set_num_channels(8)
-except pygame.error as e:
-    log(f"Audio initialization failed: {e}—running without sound")
-    pygame.mixer.quit()
-
-try:
-    pygame.joystick.init()
-    joystick_count = pygame.joystick.get_count()
-    log(f"Detected {joystick_count} joystick(s)")
-except Exception as e:
-    log(f"Joystick initialization failed: {e}")
+LOG_MAX_BYTES = 2 * 1024 * 1024  # Rotate to eagle_strike_log.txt.1 once the file passes 2 MB
+LOG_BACKUP_COUNT = 3
+log_level = {"DEBUG": LOG_DEBUG, "INFO": LOG_INFO, "WARNING": LOG_WARNING, "ERROR": LOG_ERROR}.get(
+    os.environ.get("EAGLE_STRIKE_LOG_LEVEL", "INFO").upper(), LOG_INFO)
+log_queue = queue.SimpleQueue()
+log_thread = None
+log_thread_lock = threading.Lock()  # log() is also called from asset worker threads
+log_sites = {}  # (code, line) -> [last emit time, suppressed count] for rate-limited calls
+
+def log(message, level=LOG_INFO, every=0):
+    # Hot-path safe: filtering and enqueueing only, the writer thread does formatting and file I/O.
+    # every > 0 rate limits this call site to one message per `every` seconds.
+    if level < log_level:
+        return
+    if every:
+        caller = sys._getframe(1)
+        site = (caller.f_code, caller.f_lineno)
+        now = time.monotonic()
+        entry = log_sites.get(site)
+        if entry is not None:
+            if now - entry[0] < every:
+                entry[1] += 1
+                return
+            if entry[1]:
+                message = f"{message} ({entry[1]} similar suppressed)"
+            entry[0], entry[1] = now, 0
+        else:
+            log_sites[site] = [now, 0]
+    log_queue.put((time.time(), level, message))
+    if log_thread is None:
+        start_logging()
+
+def start_logging():
+    global log_thread
+    with log_thread_lock:
+        if log_thread is not None:
+            return
+        log_thread = threading.Thread(target=log_writer, name="eagle-strike-log", daemon=True)
+        log_thread.start()
+    atexit.register(stop_logging)
+
+def stop_logging():
+    global log_thread
+    if log_thread is None:
+        return
+    log_queue.put(None)
+    log_thread.join(timeout=2)
+    log_thread = None
+
+def rotate_log():
+    for i in range(LOG_BACKUP_COUNT - 1, 0, -1):
+        src = f"{log_file}.{i}"
+        if os.path.exists(src):
+            os.replace(src, f"{log_file}.{i + 1}")
+    if os.path.exists(log_file):
+        os.replace(log_file, f"{log_file}.1")
+
+def log_writer():
+    f = None
+    size = 0
+    running = True
+    while running:
+        batch = [log_queue.get()]
+        while True:
+            try:
+                batch.append(log_queue.get_nowait())
+            except queue.Empty:
+                break
+        if None in batch:
+            running = False
+            batch = batch[:batch.index(None)]
+        lines = []
+        for stamp, level, message in batch:
+            timestamp = datetime.datetime.fromtimestamp(stamp).strftime("%Y-%m-%d %H:%M:%S")
+            if level == LOG_INFO:
+                lines.append(f"[{timestamp}] {message}\n")
+            else:
+                lines.append(f"[{timestamp}] {LOG_LEVEL_NAMES.get(level, level)}: {message}\n")
+        text = "".join(lines)
+        try:
+            if f is None:
+                f = open(log_file, "a", encoding="utf-8")
+                size = f.tell()
+            if size and size + len(text) > LOG_MAX_BYTES:
+                f.close()
+                rotate_log()
+                f = open(log_file, "a", encoding="utf-8")
+                size = 0
+            f.write(text)
+            f.flush()
+            size += len(text)
+        except OSError:
+            # Logging must never take the game down; drop the batch and retry with a fresh handle.
+            if f is not None:
+                f.close()
+            f = None
+    if f is not None:
+        f.close()
+
+FLIGHT_RECORDER_FRAMES = 600  # ~10 seconds of gameplay at 60 FPS
+STALL_THRESHOLD_MS = 250
+STALL_DUMP_COOLDOWN = 30.0  # seconds between stall dumps so a slow machine doesn't hammer the disk
+
+class FlightRecorder:
+    # Keeps the last N frames of structured events in memory; nothing touches the disk until dump().
+    def __init__(self, max_frames=FLIGHT_RECORDER_FRAMES):
+        self.frames = collections.deque(maxlen=max_frames)
+        self.frame = 0
+        self.events = []
+        self.frames.append((self.frame, time.time(), self.events))
+        self.last_stall_dump = 0.0
+
+    def begin_frame(self):
+        self.frame += 1
+        self.events = []
+        self.frames.append((self.frame, time.time(), self.events))
+
+    def record(self, event, **fields):
+        self.events.append((event, fields))
+
+    def end_frame(self, frame_ms, **fields):
+        self.events.append(("frame", dict(fields, ms=round(frame_ms, 2))))
+        if frame_ms >= STALL_THRESHOLD_MS:
+            now = time.monotonic()
+            if now - self.last_stall_dump >= STALL_DUMP_COOLDOWN:
+                self.last_stall_dump = now
+                log(f"Long frame: {frame_ms:.0f} ms", LOG_WARNING)
+                self.dump("stall", background=True)
+
+    def dump(self, reason, detail=None, background=False):
+        snapshot = [(frame, stamp, list(events)) for frame, stamp, events in self.frames]
+        path = os.path.join(os.path.abspath("."), f"eagle_strike_flight_{reason}.txt")
+        if background:
+            threading.Thread(target=self.write, args=(path, reason, detail, snapshot), daemon=True).start()
+        else:
+            self.write(path, reason, detail, snapshot)
+
+    def write(self, path, reason, detail, snapshot):
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                header = {"reason": reason, "time": datetime.datetime.now().isoformat(timespec="seconds")}
+                if detail:
+                    header["detail"] = detail
+                f.write(json.dumps(header) + "\n")
+                for frame, stamp, events in snapshot:
+                    for event, fields in events:
+                        f.write(json.dumps(dict(fields, frame=frame, t=round(stamp, 3), event=event), default=str) + "\n")
+            log(f"Flight recorder dumped {len(snapshot)} frames to {path} ({reason})")
+        except Exception as e:
+            log(f"Flight recorder dump failed: {e}", LOG_ERROR)
+
+flight_recorder = FlightRecorder()
 
 WIDTH = 800
 HEIGHT = 600
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Eagle Strike v1.1")
-clock = pygame.time.Clock()
+# Created by init_pygame(); importing this module opens no window and loads nothing.
+screen = None
+world = None  # Where the playfield is drawn: the screen itself, or a smaller offscreen surface when RENDER_SCALE < 1
+clock = None
+font = None
+title_font = None
+
+def read_render_scale():
+    # EAGLE_STRIKE_RENDER_SCALE trades sharpness for fill rate; snapped to quarter steps so tiles and the
+    # 800x600 playfield still map onto whole pixels.
+    try:
+        scale = float(os.environ.get("EAGLE_STRIKE_RENDER_SCALE", "1"))
+    except ValueError:
+        return 1.0
+    return min(1.0, max(0.25, round(scale * 4) / 4))
+
+RENDER_SCALE = read_render_scale()
+
+SIM_HZ = 60  # Gameplay speeds, cooldowns and timers are all tuned per 1/60 s step
+SIM_DT = 1.0 / SIM_HZ
+MAX_SIM_STEPS = 5  # Catch-up limit per drawn frame; past this a very slow machine slows the game instead
+
+def read_max_fps():
+    # EAGLE_STRIKE_MAX_FPS caps drawn frames only (0 = uncapped); the simulation always runs at SIM_HZ.
+    try:
+        return max(0, int(os.environ.get("EAGLE_STRIKE_MAX_FPS", "60")))
+    except ValueError:
+        return 60
+
+MAX_FPS = read_max_fps()
+
+def init_pygame():
+    global screen, world, clock, font, title_font
+    try:
+        pygame.init()
+    except Exception as e:
+        log(f"Pygame initialization failed: {e}", LOG_ERROR)
+        raise
+
+    try:
+        pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
+        pygame.mixer.set_num_channels(8)
+    except pygame.error as e:
+        log(f"Audio initialization failed: {e}—running without sound", LOG_WARNING)
+        pygame.mixer.quit()
+
+    try:
+        pygame.joystick.init()
+        joystick_count = pygame.joystick.get_count()
+        log(f"Detected {joystick_count} joystick(s)")
+    except Exception as e:
+        log(f"Joystick initialization failed: {e}", LOG_WARNING)
+
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Eagle Strike v1.1")
+    if RENDER_SCALE < 1:
+        world = pygame.Surface((int(WIDTH * RENDER_SCALE), int(HEIGHT * RENDER_SCALE))).convert()
+        log(f"Rendering the playfield at {world.get_width()}x{world.get_height()} (scale {RENDER_SCALE})")
+    else:
+        world = screen
+    clock = pygame.time.Clock()
+    font = pygame.font.SysFont(None, 24)
+    title_font = pygame.font.SysFont(None, 48)
+
+def world_sprite(surface):
+    # Sprite caches store their entries already sized for the world surface, so drawing only scales positions
+    if RENDER_SCALE == 1:
+        return surface
+    size = (max(1, round(surface.get_width() * RENDER_SCALE)), max(1, round(surface.get_height() * RENDER_SCALE)))
+    colorkey = surface.get_colorkey()
+    if colorkey is not None or surface.get_bitsize() < 24:
+        # Filtering would smear the colorkey into the edges
+        copy = pygame.transform.scale(surface, size)
+        if colorkey is not None:
+            copy.set_colorkey(colorkey, pygame.RLEACCEL)
+        return copy
+    return pygame.transform.smoothscale(surface, size)
+
+def world_rect(x, y, w, h):
+    return (x * RENDER_SCALE, y * RENDER_SCALE, w * RENDER_SCALE, h * RENDER_SCALE)
+
+def present_world():
+    if world is not screen:
+        pygame.transform.scale(world, (WIDTH, HEIGHT), screen)
 
 WHITE = (255, 255, 255)
 GREEN = (0, 255, 0)
@@ -63,141 +290,415 @@ NEON_PINK = (255, 20, 147)
 NEON_BLUE = (0, 255, 255)
 NEON_GREEN = (57, 255, 20)
 
-HIGH_SCORE_FILE = resource_path("highscore.txt")
+HIGH_SCORE_FILE = "highscore.txt"
 
 def load_high_score():
     try:
-        with open(HIGH_SCORE_FILE, "r") as f:
+        with open(resource_path(HIGH_SCORE_FILE), "r") as f:
             return int(f.read().strip())
     except (FileNotFoundError, ValueError) as e:
-        log(f"High score load failed: {e}—defaulting to 0")
+        log(f"High score load failed: {e}—defaulting to 0", LOG_WARNING)
         return 0
 
 def save_high_score(score):
     try:
         current_high_score = load_high_score()
         if score > current_high_score:
-            with open(HIGH_SCORE_FILE, "w") as f:
+            with open(resource_path(HIGH_SCORE_FILE), "w") as f:
                 f.write(str(score))
             log(f"New high score saved: {score}")
             return score
         return current_high_score
     except Exception as e:
-        log(f"High score save failed: {e}")
+        log(f"High score save failed: {e}", LOG_ERROR)
         return load_high_score()
 
-def load_sprite_frames(filename_prefix, frame_count, size_x, size_y, fallback_color):
-    frames = []
-    for i in range(frame_count):
-        filename = f"{filename_prefix}{i+1}.png"
-        try:
-            sprite = pygame.image.load(resource_path(filename)).convert_alpha()
-            sprite = pygame.transform.scale(sprite, (size_x, size_y))
-            frames.append(sprite)
-        except Exception as e:
-            log(f"Failed to load {filename}: {e}—using fallback")
-            surf = pygame.Surface((size_x, size_y), pygame.SRCALPHA)
-            surf.fill(fallback_color)
-            frames.append(surf)
-    if not frames:
-        log(f"No frames loaded for {filename_prefix}—using single fallback")
-        surf = pygame.Surface((size_x, size_y), pygame.SRCALPHA)
-        surf.fill(fallback_color)
-        frames.append(surf)
-    return frames
+ASSET_CACHE_DIR = os.path.join(os.path.abspath("."), "asset_cache")
+asset_cache_format = "RGBA"  # Replaced by the display's own byte order once the window exists
+ASSET_CACHE_EXTENSIONS = (".rgba", ".bgra", ".argb", ".tmp")
+asset_cache_used = set()  # Cache files read or written this run; everything else is pruned at shutdown
+
+def display_pixel_format():
+    masks = pygame.Surface((1, 1), pygame.SRCALPHA).convert_alpha().get_masks()
+    if masks == (0xff0000, 0xff00, 0xff, 0xff000000):
+        return "BGRA" if sys.byteorder == "little" else "ARGB"
+    return "RGBA"
+
+def asset_cache_path(filename, data, size_x, size_y):
+    # Keyed on the asset's name and contents, not its path or mtime: the onefile exe extracts
+    # to a fresh temp folder with new timestamps on every launch
+    key = f"{filename}|{hashlib.sha1(data).hexdigest()}|{size_x}x{size_y}|{asset_cache_format}"
+    cache_path = os.path.join(ASSET_CACHE_DIR, f"{hashlib.sha1(key.encode()).hexdigest()}.{asset_cache_format.lower()}")
+    asset_cache_used.add(cache_path)
+    return cache_path
+
+def prune_asset_cache():
+    try:
+        names = os.listdir(ASSET_CACHE_DIR)
+    except OSError:
+        return
+    removed = 0
+    for name in names:
+        path = os.path.join(ASSET_CACHE_DIR, name)
+        if name.endswith(ASSET_CACHE_EXTENSIONS) and path not in asset_cache_used:
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError as e:
+                log(f"Asset cache prune failed for {path}: {e}", LOG_WARNING, every=5)
+    if removed:
+        log(f"Removed {removed} stale sprites from {ASSET_CACHE_DIR}")
+
+def read_cached_sprite(cache_path, size_x, size_y):
+    try:
+        with open(cache_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size != size_x * size_y * 4:
+                return None
+            pixels = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        # The surface borrows the mapping; it is released once finish_sprite() has made its converted copy.
+        return pygame.image.frombuffer(pixels, (size_x, size_y), asset_cache_format)
+    except (OSError, ValueError, pygame.error):
+        return None
 
-def load_sprite(filename, size_x, size_y, fallback_color):
+def write_cached_sprite(cache_path, sprite):
     try:
-        sprite = pygame.image.load(resource_path(filename)).convert_alpha()
-        return pygame.transform.scale(sprite, (size_x, size_y))
+        os.makedirs(ASSET_CACHE_DIR, exist_ok=True)
+        temp_path = f"{cache_path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(pygame.image.tobytes(sprite, asset_cache_format))
+        os.replace(temp_path, cache_path)
+    except (OSError, pygame.error) as e:
+        log(f"Asset cache write failed for {cache_path}: {e}", LOG_WARNING, every=5)
+
+def decode_sprite(filename, size_x, size_y):
+    # Safe to run on an asset worker thread: file I/O, PNG decode and scaling only.
+    # Warm starts map the pre-scaled pixels from asset_cache/ and skip both.
+    try:
+        with open(resource_path(filename), "rb") as f:
+            data = f.read()
+        cache_path = asset_cache_path(filename, data, size_x, size_y)
+        sprite = read_cached_sprite(cache_path, size_x, size_y)
+        if sprite is not None:
+            return sprite
+        sprite = pygame.transform.scale(pygame.image.load(io.BytesIO(data), filename), (size_x, size_y))
     except Exception as e:
-        log(f"Failed to load {filename}: {e}—using fallback")
+        log(f"Failed to load {filename}: {e}—using fallback", LOG_WARNING)
+        return None
+    write_cached_sprite(cache_path, sprite)
+    return sprite
+
+def finish_sprite(sprite, size_x, size_y, fallback_color):
+    # Main thread: pixel format conversion against the display, or the fallback block.
+    if sprite is None:
         surf = pygame.Surface((size_x, size_y), pygame.SRCALPHA)
         surf.fill(fallback_color)
         return surf
+    return sprite.convert_alpha()
 
 def load_sound(filename):
     try:
         sound = pygame.mixer.Sound(resource_path(filename))
         return sound
     except Exception as e:
-        log(f"Failed to load sound {filename}: {e}")
+        log(f"Failed to load sound {filename}: {e}", LOG_WARNING)
         return None
 
-def load_music(filename):
-    try:
-        pygame.mixer.music.load(resource_path(filename))
-        return True
-    except Exception as e:
-        log(f"Failed to load music {filename}: {e}")
-        return False
+ASSET_WORKERS = min(8, os.cpu_count() or 2)
+
+class AssetManager:
+    # Decodes files on a thread pool in submission order; get() blocks on one asset and finishes it on the main thread.
+    def __init__(self, workers=ASSET_WORKERS):
+        self.workers = workers
+        self.executor = None
+        self.pending = {}  # name -> (future, finalize)
+        self.groups = {}  # name -> [part names], for multi-frame sprites
+        self.loaded = {}
+        self.sprite_jobs = []  # Futures that read or write asset_cache/
+        self.started = None
+
+    def submit(self, name, decode, finalize=None):
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="eagle-strike-assets")
+            self.started = time.perf_counter()
+        future = self.executor.submit(decode)
+        self.pending[name] = (future, finalize)
+        return future
+
+    def load_sprite(self, name, filename, size_x, size_y, fallback_color):
+        self.sprite_jobs.append(self.submit(name, lambda: decode_sprite(filename, size_x, size_y),
+                                            lambda sprite: finish_sprite(sprite, size_x, size_y, fallback_color)))
+
+    def load_sprite_frames(self, name, filename_prefix, frame_count, size_x, size_y, fallback_color):
+        self.groups[name] = [f"{name}[{i}]" for i in range(frame_count)]
+        for i, part in enumerate(self.groups[name]):
+            self.load_sprite(part, f"{filename_prefix}{i+1}.png", size_x, size_y, fallback_color)
+
+    def load_sound(self, name, filename):
+        self.submit(name, lambda: load_sound(filename))
+
+    def ready(self, name):
+        if name in self.groups:
+            return all(self.ready(part) for part in self.groups[name])
+        return name in self.loaded or (name in self.pending and self.pending[name][0].done())
+
+    def get(self, name):
+        if name in self.groups:
+            return [self.get(part) for part in self.groups[name]]
+        if name not in self.loaded:
+            future, finalize = self.pending.pop(name)
+            value = future.result()
+            self.loaded[name] = finalize(value) if finalize else value
+            if not self.pending:
+                log(f"All assets loaded in {(time.perf_counter() - self.started) * 1000:.0f} ms")
+        return self.loaded[name]
+
+    def poll(self):
+        # Finish whatever the workers have completed so later get() calls don't have to.
+        for name in [name for name, (future, _) in self.pending.items() if future.done()]:
+            self.get(name)
+        return len(self.pending)
+
+    def shutdown(self):
+        if self.executor is not None:
+            # Only prune once every sprite decode has run, or sprites still queued would look unused
+            finished = all(future.done() and not future.cancelled() for future in self.sprite_jobs)
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+            if finished:
+                prune_asset_cache()
 
 player_size = 40
+large_player_size = 60  # Dropship size once dual blasts unlock at Level 10
 alien_size = 30
 boss_size = 100
 power_up_size = 20
 battle_buddy_size = 30
-player_frames = load_sprite_frames("dropship", 2, player_size, player_size, WHITE)
-bug_frames = load_sprite_frames("terminid", 2, alien_size, alien_size, WHITE)
-bot_frames = load_sprite_frames("automaton", 2, alien_size, alien_size, WHITE)
-squid_frames = load_sprite_frames("illuminate", 2, alien_size, alien_size, WHITE)
-hunter_frames = load_sprite_frames("hunter", 2, alien_size, alien_size, RED)
-boss1_frames = load_sprite_frames("boss1", 2, boss_size, boss_size, RED)
-boss2_frames = load_sprite_frames("boss2", 2, boss_size, boss_size, PURPLE)
-boss3_frames = load_sprite_frames("boss3", 2, boss_size, boss_size, ORANGE)
-boss_types = [boss1_frames, boss2_frames, boss3_frames]
-power_up_sprites = {
-    "rate": load_sprite("rate_of_fire.png", power_up_size, power_up_size, GREEN),
-    "reinforce": load_sprite("reinforce.png", power_up_size, power_up_size, WHITE),
-    "diver_pod": load_sprite("diver_pod.png", power_up_size, power_up_size, WHITE),
-    "resupply": load_sprite("resupply.png", power_up_size, power_up_size, YELLOW),
-    "hellbomb": load_sprite("hellbomb.png", power_up_size, power_up_size, ORANGE),
-    "mg94": load_sprite("mg94.png", power_up_size, power_up_size, GREEN),
-    "eat17": load_sprite("eat17.png", power_up_size, power_up_size, ORANGE),
-    "shield": load_sprite("shield.png", power_up_size, power_up_size, BLUE),
-    "trishot": load_sprite("trishot.png", power_up_size, power_up_size, RED),
-    "quad": load_sprite("quadshot.png", power_up_size, power_up_size, PURPLE),
-    "burst": load_sprite("burst.png", power_up_size, power_up_size, CYAN),
-    "eagle_sweat": load_sprite("eagle_sweat.png", power_up_size, power_up_size, YELLOW),
-    "battle_buddy": load_sprite("battle_buddy.png", power_up_size, power_up_size, NEON_GREEN)
+ATLAS_PAGE_SIZE = 512
+ATLAS_PADDING = 2
+
+class SpriteAtlas:
+    # Packs small sprites into a few shared pages; every packed sprite becomes a subsurface of its page,
+    # so existing references keep working and draw code can batch through Surface.blits().
+    def __init__(self, page_size=ATLAS_PAGE_SIZE, padding=ATLAS_PADDING):
+        self.page_size = page_size
+        self.padding = padding
+        self.pages = []
+        self.regions = {}  # subsurface -> (page sized for the world surface, Rect on it)
+
+    def pack(self, sprites):
+        unique = list(dict.fromkeys(s for s in sprites if s.get_width() <= self.page_size and s.get_height() <= self.page_size))
+        unique.sort(key=lambda s: (s.get_height(), s.get_width()), reverse=True)
+        placements = []  # (page index, sprite, Rect), shelf packed tallest first
+        page_index, x, y, shelf_height = len(self.pages), 0, 0, 0
+        page_heights = {}
+        for sprite in unique:
+            width, height = sprite.get_size()
+            if x + width > self.page_size:
+                x, y, shelf_height = 0, y + shelf_height, 0
+            if y + height > self.page_size:
+                page_index, x, y, shelf_height = page_index + 1, 0, 0, 0
+            placements.append((page_index, sprite, pygame.Rect(x, y, width, height)))
+            page_heights[page_index] = max(page_heights.get(page_index, 0), y + height)
+            x += width + self.padding
+            shelf_height = max(shelf_height, height + self.padding)
+        new_pages = {}
+        for index, height in page_heights.items():
+            page = pygame.Surface((self.page_size, height), pygame.SRCALPHA)
+            page.fill((0, 0, 0, 0))
+            new_pages[index] = page
+        packed = {}
+        for index, sprite, rect in placements:
+            new_pages[index].blit(sprite, rect)
+        for index in sorted(new_pages):
+            new_pages[index] = new_pages[index].convert_alpha()
+            self.pages.append(new_pages[index])
+        world_pages = {index: world_sprite(page) for index, page in new_pages.items()}
+        for index, sprite, rect in placements:
+            sub = new_pages[index].subsurface(rect)
+            left, top = round(rect.x * RENDER_SCALE), round(rect.y * RENDER_SCALE)
+            self.regions[sub] = (world_pages[index], pygame.Rect(left, top, round(rect.right * RENDER_SCALE) - left, round(rect.bottom * RENDER_SCALE) - top))
+            packed[sprite] = sub
+        log(f"Packed {len(placements)} sprites into {len(new_pages)} atlas page(s)")
+        return packed
+
+    def blit_item(self, sprite, x, y):
+        # Surface.blits() entry on the world surface, read from the shared page when the sprite is packed
+        region = self.regions.get(sprite)
+        if region is None:
+            page = world_sprite(sprite)
+            region = self.regions[sprite] = (page, page.get_rect())
+        return (region[0], (x * RENDER_SCALE, y * RENDER_SCALE), region[1])
+
+sprite_atlas = SpriteAtlas()
+
+POWER_UP_FILES = {
+    "rate": ("rate_of_fire.png", GREEN),
+    "reinforce": ("reinforce.png", WHITE),
+    "diver_pod": ("diver_pod.png", WHITE),
+    "resupply": ("resupply.png", YELLOW),
+    "hellbomb": ("hellbomb.png", ORANGE),
+    "mg94": ("mg94.png", GREEN),
+    "eat17": ("eat17.png", ORANGE),
+    "shield": ("shield.png", BLUE),
+    "trishot": ("trishot.png", RED),
+    "quad": ("quadshot.png", PURPLE),
+    "burst": ("burst.png", CYAN),
+    "eagle_sweat": ("eagle_sweat.png", YELLOW),
+    "battle_buddy": ("battle_buddy.png", NEON_GREEN)
+}
+INTRO_FRAME_COUNT = 8
+SOUND_FILES = {
+    "intro_music": "intro_music.wav",
+    "shoot": "shoot.wav",
+    "boom": "boom.wav",
+    "hit": "hit.wav",
+    "ship_hit": "ship_hit.wav",
+    "thrust": "thrust.wav",
+    "level_up": "level_up.wav",
+    "boss_intro": "boss_intro.wav",
+    "eagle_sweat": "eagle_sweat_trigger.wav",
+    "battle_buddy": "battle_buddy.wav"
 }
-start_screen_sprite = load_sprite("start_screen.png", WIDTH, HEIGHT, BLACK)
-battle_buddy_sprite = load_sprite("battle_buddy.png", battle_buddy_size, battle_buddy_size, NEON_GREEN)
-
-intro_frames = [load_sprite(f"intro{i}.png", WIDTH, HEIGHT, BLACK) for i in range(1, 9)]
-intro_music = load_sound("intro_music.wav")
-if intro_music: intro_music.set_volume(0.2)
-
-shoot_sound = load_sound("shoot.wav")
-if shoot_sound: shoot_sound.set_volume(0.1)
-boom_sound = load_sound("boom.wav")
-if boom_sound: boom_sound.set_volume(0.15)
-hit_sound = load_sound("hit.wav")
-if hit_sound: hit_sound.set_volume(0.08)
-ship_hit_sound = load_sound("ship_hit.wav")
-if ship_hit_sound: ship_hit_sound.set_volume(0.1)
-hunter_thrust_sound = load_sound("thrust.wav")
-if hunter_thrust_sound: hunter_thrust_sound.set_volume(0.05)
-level_up_sound = load_sound("level_up.wav")
-if level_up_sound: level_up_sound.set_volume(0.15)
-boss_level_sound = load_sound("boss_intro.wav")
-if boss_level_sound: boss_level_sound.set_volume(0.2)
-eagle_sweat_sound = load_sound("eagle_sweat_trigger.wav")
-if eagle_sweat_sound: eagle_sweat_sound.set_volume(0.18)
-battle_buddy_sound = load_sound("battle_buddy.wav")
-if battle_buddy_sound: battle_buddy_sound.set_volume(0.18)
-power_up_sounds = [load_sound(f"power_up{i}.wav") for i in range(1, 7)]
-power_up_sounds = [s for s in power_up_sounds if s]
-for s in power_up_sounds: s.set_volume(0.08)
+
+# Filled in by bind_title_assets() / bind_game_assets() as the asset workers finish.
+start_screen_sprite = None
+power_up_sprites = {}
+bug_frames = bot_frames = squid_frames = hunter_frames = None
+player_frames = None
+boss_types = []
+battle_buddy_sprite = None
+intro_music = shoot_sound = boom_sound = hit_sound = ship_hit_sound = hunter_thrust_sound = None
+level_up_sound = boss_level_sound = eagle_sweat_sound = battle_buddy_sound = None
+power_up_sounds = []
+game_assets_bound = False
+assets = AssetManager()
+
+def queue_assets():
+    global asset_cache_format
+    asset_cache_format = display_pixel_format()
+    # Title screen assets first so the window has something to show while the rest decodes.
+    assets.load_sprite("start_screen", "start_screen.png", WIDTH, HEIGHT, BLACK)
+    for key, (filename, color) in POWER_UP_FILES.items():
+        assets.load_sprite(f"power_up_{key}", filename, power_up_size, power_up_size, color)
+    assets.load_sprite_frames("bug", "terminid", 2, alien_size, alien_size, WHITE)
+    assets.load_sprite_frames("bot", "automaton", 2, alien_size, alien_size, WHITE)
+    assets.load_sprite_frames("squid", "illuminate", 2, alien_size, alien_size, WHITE)
+    assets.load_sprite_frames("hunter", "hunter", 2, alien_size, alien_size, RED)
+    assets.load_sound("intro_music_sound", SOUND_FILES["intro_music"])
+    for i in range(1, INTRO_FRAME_COUNT + 1):
+        assets.load_sprite(f"intro{i}", f"intro{i}.png", WIDTH, HEIGHT, BLACK)
+    assets.load_sprite_frames("player", "dropship", 2, player_size, player_size, WHITE)
+    assets.load_sprite_frames("player_large", "dropship", 2, large_player_size, large_player_size, WHITE)
+    assets.load_sprite_frames("boss1", "boss1", 2, boss_size, boss_size, RED)
+    assets.load_sprite_frames("boss2", "boss2", 2, boss_size, boss_size, PURPLE)
+    assets.load_sprite_frames("boss3", "boss3", 2, boss_size, boss_size, ORANGE)
+    assets.load_sprite("battle_buddy", "battle_buddy.png", battle_buddy_size, battle_buddy_size, NEON_GREEN)
+    for name, filename in SOUND_FILES.items():
+        if name != "intro_music":
+            assets.load_sound(f"{name}_sound", filename)
+    for i in range(1, 7):
+        assets.load_sound(f"power_up{i}_sound", f"power_up{i}.wav")
+    assets.submit("nebula_stamps", warm_nebula_stamps)
+    assets.submit("projectile_sprites", build_projectile_sprites)
+
+def bind_title_assets():
+    global start_screen_sprite, power_up_sprites, bug_frames, bot_frames, squid_frames, hunter_frames
+    if start_screen_sprite is not None:
+        return
+    start_screen_sprite = assets.get("start_screen")
+    power_up_sprites = {key: assets.get(f"power_up_{key}") for key in POWER_UP_FILES}
+    bug_frames = assets.get("bug")
+    bot_frames = assets.get("bot")
+    squid_frames = assets.get("squid")
+    hunter_frames = assets.get("hunter")
+
+def bind_game_assets():
+    global player_frames, boss_types, battle_buddy_sprite, intro_music, shoot_sound, boom_sound, hit_sound, ship_hit_sound, hunter_thrust_sound, level_up_sound, boss_level_sound, eagle_sweat_sound, battle_buddy_sound, power_up_sounds, game_assets_bound
+    if game_assets_bound:
+        return
+    bind_title_assets()
+    player_frames = assets.get("player")
+    boss_types = [assets.get("boss1"), assets.get("boss2"), assets.get("boss3")]
+    battle_buddy_sprite = assets.get("battle_buddy")
+    intro_music = assets.get("intro_music_sound")
+    shoot_sound = assets.get("shoot_sound")
+    boom_sound = assets.get("boom_sound")
+    hit_sound = assets.get("hit_sound")
+    ship_hit_sound = assets.get("ship_hit_sound")
+    hunter_thrust_sound = assets.get("thrust_sound")
+    level_up_sound = assets.get("level_up_sound")
+    boss_level_sound = assets.get("boss_intro_sound")
+    eagle_sweat_sound = assets.get("eagle_sweat_sound")
+    battle_buddy_sound = assets.get("battle_buddy_sound")
+    power_up_sounds = [s for s in (assets.get(f"power_up{i}_sound") for i in range(1, 7)) if s]
+    game_assets_bound = True
+    build_sprite_atlas()
+    update_volumes()
+
+def build_sprite_atlas():
+    global battle_buddy_sprite
+    # Swap the lists and dict entries in place so live aliens keep pointing at the packed frames.
+    frame_lists = [bug_frames, bot_frames, squid_frames, hunter_frames] + boss_types
+    packed = sprite_atlas.pack([s for frames in frame_lists for s in frames] + list(power_up_sprites.values()) + [battle_buddy_sprite])
+    for frames in frame_lists:
+        frames[:] = [packed.get(s, s) for s in frames]
+    for key, sprite in power_up_sprites.items():
+        power_up_sprites[key] = packed.get(sprite, sprite)
+    battle_buddy_sprite = packed.get(battle_buddy_sprite, battle_buddy_sprite)
 
 MUSIC_TRACKS = [f"background_music{i}.wav" for i in range(1, 11)]
-loaded_music = [track for track in MUSIC_TRACKS if load_music(track)]
-music_enabled = bool(loaded_music)
+loaded_music = []
+music_enabled = False
 current_track = None
 master_volume = 0.2
-high_score = load_high_score()
+high_score = 0
 first_level_1_start = True
 
+MUSIC_CATALOG_FILE = os.path.join(ASSET_CACHE_DIR, "music_catalog.json")
+
+def probe_music(path):
+    # A RIFF/WAVE header is enough to list the track; the stream is only opened when it plays.
+    try:
+        with open(path, "rb") as f:
+            header = f.read(12)
+    except OSError:
+        return False
+    return header[:4] == b"RIFF" and header[8:12] == b"WAVE"
+
+def init_music():
+    global loaded_music, music_enabled
+    try:
+        with open(MUSIC_CATALOG_FILE, "r") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        cached = {}
+    catalog = {}
+    loaded_music = []
+    for track in MUSIC_TRACKS:
+        path = resource_path(track)
+        try:
+            stat = os.stat(path)
+        except OSError as e:
+            log(f"Failed to load music {track}: {e}", LOG_WARNING)
+            continue
+        key = f"{stat.st_mtime_ns}:{stat.st_size}"
+        entry = cached.get(track)
+        playable = entry["playable"] if isinstance(entry, dict) and entry.get("key") == key else probe_music(path)
+        catalog[track] = {"key": key, "playable": playable}
+        if playable:
+            loaded_music.append(track)
+        else:
+            log(f"Failed to load music {track}: not a WAV file", LOG_WARNING)
+    music_enabled = bool(loaded_music)
+    if catalog != cached:
+        try:
+            os.makedirs(ASSET_CACHE_DIR, exist_ok=True)
+            with open(MUSIC_CATALOG_FILE, "w") as f:
+                json.dump(catalog, f, indent=1)
+        except OSError as e:
+            log(f"Music catalog save failed: {e}", LOG_WARNING)
+    log(f"Music catalog: {len(loaded_music)}/{len(MUSIC_TRACKS)} tracks available")
+
 def play_music_for_level(level):
     global current_track
     if not music_enabled: return
@@ -212,7 +713,7 @@ def play_music_for_level(level):
             current_track = new_track
             log(f"Playing music: {new_track} for Level {level}")
     except Exception as e:
-        log(f"Music play failed for Level {level}: {e}")
+        log(f"Music play failed for Level {level}: {e}", LOG_ERROR)
 
 def update_volumes():
     try:
@@ -223,9 +724,7 @@ def update_volumes():
         for sound in power_up_sounds: sound.set_volume(master_volume * 0.08)
         if music_enabled: pygame.mixer.music.set_volume(master_volume * 0.1)
     except Exception as e:
-        log(f"Volume update failed: {e}")
-
-update_volumes()
+        log(f"Volume update failed: {e}", LOG_ERROR)
 
 player_x = WIDTH // 2 - player_size // 2
 player_y = HEIGHT - 100
@@ -236,18 +735,23 @@ player_speed = 5
 player_frame = 0
 player_frame_timer = 0
 player_frame_speed = 10
-player_health = 500
-PLAYER_MAX_HEALTH = 500
+player_health = 200
+PLAYER_MAX_HEALTH = 200
 aliens = []
-shots = []
-enemy_shots = []
+projectiles = None  # ProjectileStore, created by run_game
 power_ups = []
-battle_buddy_shots = []
 alien_speed = 2
 hunter_speed = 4
 boss_speed_base = 2.0
 spawn_timer = 0
 spawn_interval = 15
+frame_count = 0
+kill_streak = 0
+highest_kill_streak = 0
+capture_streak = 0
+highest_capture_streak = 0
+break_free_used = False
+prev_player_x = prev_player_y = 0  # Player position one simulation step ago, for interpolation
 shot_speed = -12
 shot_length = 20
 shot_width = 4
@@ -259,7 +763,6 @@ enemy_shot_width = 3
 enemy_shot_chance = 0.01
 boss_shot_chance_base = 0.03
 battle_buddy_active = False
-battle_buddy_timer = 0
 battle_buddy_x = 0
 battle_buddy_y = 0
 battle_buddy_shot_cooldown = 10
@@ -268,23 +771,14 @@ score = 0
 level = 1
 divers_rescued = 3
 double_shot = False
-double_shot_timer = 0
 piercing_shot = False
-piercing_shot_timer = 0
 trishot = False
-trishot_timer = 0
 quad_shot = False
-quad_shot_timer = 0
 burst_mode = False
-burst_timer = 0
 shield_active = False
-shield_timer = 0
 eagle_sweat_active = False
-eagle_sweat_timer = 0
 paused = False
-font = pygame.font.SysFont(None, 24)
-title_font = pygame.font.SysFont(None, 48)
-stars = []
+stars = None
 planet_surface = None
 level_up_text = None
 level_up_duration = 60
@@ -295,6 +789,8 @@ boss_frame_speed = 10
 BASE_THRESHOLD = 5000
 BOSS_HEALTH_BASE = 900
 joystick = None
+scripted_keys = None  # Replaces the keyboard in headless runs
+input_recorder = None
 
 PLANET_TYPES = [
     {"name": "Desert", "ground_color": (194, 178, 128), "feature_color": (255, 204, 102), "features": "dunes"},
@@ -319,25 +815,123 @@ PLANET_TYPES = [
     {"name": "Lunar", "ground_color": (112, 128, 144), "feature_color": (192, 192, 192), "features": "craters"}
 ]
 
-class Star:
+STAR_COLORS = [WHITE, GRAY, YELLOW, ORANGE, BLUE, PURPLE, CYAN]
+STARFIELD_LAYERS = [  # (count, min speed, max speed, min radius, max radius), far to near
+    (100, 0.5, 1.2, 1, 3),  # The original Level 1 sky; radius 0 layers are single pixels written straight into the surface
+]
+star_sprites = {}  # (color, radius) -> colorkeyed circle stamp, sized for the world surface
+
+def star_sprite(color, radius):
+    sprite = star_sprites.get((color, radius))
+    if sprite is None:
+        sprite = pygame.Surface((radius * 2 + 1, radius * 2 + 1))
+        if radius:
+            pygame.draw.circle(sprite, color, (radius, radius), radius)
+        else:
+            sprite.fill(color)
+        sprite.set_colorkey(BLACK)
+        sprite = star_sprites[(color, radius)] = world_sprite(sprite)
+    return sprite
+
+class Starfield:
     def __init__(self, level):
-        self.x = random.randint(0, WIDTH)
-        self.y = random.randint(0, HEIGHT)
-        self.size = random.randint(1, max(3, level))
-        self.speed = random.uniform(0.5, 1.0 + level * 0.2)
-        self.color = random.choice([WHITE, GRAY, YELLOW, ORANGE, BLUE, PURPLE, CYAN])
+        self.rng = np.random.default_rng(random.getrandbits(32))
+        speed_scale = (1.0 + level * 0.2) / 1.2
+        xs, speeds, radii = [], [], []
+        for count, min_speed, max_speed, min_radius, max_radius in STARFIELD_LAYERS:
+            xs.append(self.rng.integers(0, WIDTH + 1, count))
+            speeds.append(self.rng.uniform(min_speed, max_speed, count) * speed_scale)
+            radii.append(self.rng.integers(min_radius, max_radius + 1, count))
+        self.x = np.concatenate(xs).astype(np.float64)
+        self.y = self.rng.integers(0, HEIGHT + 1, len(self.x)).astype(np.float64)
+        self.speed = np.concatenate(speeds)
+        self.radius = np.concatenate(radii)
+        self.color = self.rng.integers(0, len(STAR_COLORS), len(self.x))
+        self.pixel_stars = np.flatnonzero(self.radius == 0)
+        self.sprite_stars = np.flatnonzero(self.radius)
+        self.all_stars = np.arange(len(self.x))
+        # Stamps for the sprite stars alone, and for every star when the surface can't take direct pixel writes
+        self.sprites = [star_sprite(STAR_COLORS[c], r) for c, r in zip(self.color[self.sprite_stars].tolist(), self.radius[self.sprite_stars].tolist())]
+        self.all_sprites = [star_sprite(STAR_COLORS[c], r) for c, r in zip(self.color.tolist(), self.radius.tolist())]
+        # Pixel stars are written as raw values, so their colors are mapped to the playfield's format up front
+        self.pixel_colors = None
+        if len(self.pixel_stars) and world is not None and world.get_bytesize() == 4:
+            self.pixel_colors = np.array([world.map_rgb(c) for c in STAR_COLORS], dtype=np.uint32)[self.color[self.pixel_stars]]
+
+    def __len__(self):
+        return len(self.x)
 
     def move(self):
         self.y += self.speed
-        if self.y > HEIGHT:
-            self.y = 0
-            self.x = random.randint(0, WIDTH)
+        wrapped = self.y > HEIGHT
+        if wrapped.any():
+            self.y[wrapped] = 0
+            self.x[wrapped] = self.rng.integers(0, WIDTH + 1, np.count_nonzero(wrapped))
 
-    def draw(self, surface):
+    def draw(self, surface, alpha=1.0):
         try:
-            pygame.draw.circle(surface, self.color, (int(self.x), int(self.y)), self.size)
+            xs = (self.x * RENDER_SCALE).astype(np.int32)
+            ys = np.floor((self.y - self.speed * (1 - alpha)) * RENDER_SCALE).astype(np.int32)
+            stamped, sprites = self.all_stars, self.all_sprites
+            if self.pixel_colors is not None and surface is world:
+                xp, yp = xs[self.pixel_stars], ys[self.pixel_stars]
+                visible = (xp < surface.get_width()) & (yp >= 0) & (yp < surface.get_height())
+                pixels = pygame.surfarray.pixels2d(surface)
+                pixels[xp[visible], yp[visible]] = self.pixel_colors[visible]
+                del pixels
+                stamped, sprites = self.sprite_stars, self.sprites
+            offsets = self.radius[stamped] * RENDER_SCALE
+            surface.blits(zip(sprites, zip((xs[stamped] - offsets).tolist(), (ys[stamped] - offsets).tolist())), doreturn=False)
         except Exception as e:
-            log(f"Star draw failed: {e}")
+            log(f"Starfield draw failed: {e}", LOG_ERROR, every=1)
+
+NEBULA_COLORS = [(ORANGE, 40), (NEON_PINK, 35), (NEON_BLUE, 30), (NEON_GREEN, 25)]  # Subtle opacity
+NEBULA_DITHER_RGB = np.array([c[:3] for c in (ORANGE, NEON_PINK, NEON_BLUE, NEON_GREEN)], dtype=np.uint8)
+NEBULA_SIZE_STEP = 20  # Oval radii snap to 20px buckets so stamps are shared across nebulae
+NEBULA_ANGLE_STEP = 30  # Degrees; ovals are symmetric, so only 0-180 needs distinct stamps
+NEBULA_WIDTHS = range(20, 61, NEBULA_SIZE_STEP)
+NEBULA_HEIGHTS = range(20, 81, NEBULA_SIZE_STEP)
+nebula_stamps = {}  # (color, w, h, angle bucket) -> (rotated oval cropped to its visible pixels, x, y)
+
+def nebula_bucket(value, step):
+    return max(step, int(round(value / step)) * step)
+
+def nebula_oval_stamp(color, oval_width, oval_height, angle):
+    angle_bucket = int(angle % 180) // NEBULA_ANGLE_STEP * NEBULA_ANGLE_STEP
+    key = (color, oval_width, oval_height, angle_bucket)
+    stamp = nebula_stamps.get(key)
+    if stamp is not None:
+        return stamp
+    # Radial alpha falloff computed over the whole oval at once (surfarray indexes [x][y])
+    dist = np.hypot(((np.arange(oval_width * 2) - oval_width) / oval_width)[:, np.newaxis],
+                    ((np.arange(oval_height * 2) - oval_height) / oval_height)[np.newaxis, :])
+    alpha = np.where(dist <= 1, (color[1] * (1 - dist * 0.9)).astype(np.int32), 0).clip(0, 255)
+    oval_surf = pygame.Surface((oval_width * 2, oval_height * 2), pygame.SRCALPHA)
+    oval_surf.fill((*color[0][:3], 0))
+    pixels = pygame.surfarray.pixels_alpha(oval_surf)
+    pixels[:] = alpha
+    del pixels
+    rotated = pygame.transform.rotate(oval_surf, angle_bucket)
+    visible = rotated.get_bounding_rect()
+    stamp = (rotated.subsurface(visible).copy(), visible.x, visible.y)
+    nebula_stamps[key] = stamp
+    return stamp
+
+def warm_nebula_stamps():
+    # The key space is small (4 colors x 3 x 4 sizes x 6 angles), so build it all off the main thread at startup.
+    for color in NEBULA_COLORS:
+        for oval_width in NEBULA_WIDTHS:
+            for oval_height in NEBULA_HEIGHTS:
+                for angle in range(0, 180, NEBULA_ANGLE_STEP):
+                    nebula_oval_stamp(color, oval_width, oval_height, angle)
+    return len(nebula_stamps)
+
+TERRAIN_WORLD_HEIGHT = HEIGHT * 4  # Features and bases repeat every four screens
+TERRAIN_TILE_HEIGHT = HEIGHT // 2
+TERRAIN_TILE_MARGIN = 48  # Taller than any feature, so clipped outlines land outside the kept strip
+TERRAIN_TILE_CACHE_SIZE = 8  # One planet's worth of tiles; the previous planet's age out as the next scrolls in
+TERRAIN_COLORKEY = (255, 0, 255)
+terrain_tiles = collections.OrderedDict()  # (seed, tile index) -> features and bases pre-drawn on a colorkeyed strip, sized for the world surface
 
 class PlanetSurface:
     def __init__(self, level):
@@ -350,6 +944,7 @@ class PlanetSurface:
         self.meteor_timer = 0
         self.meteor_active = False
         self.level = level
+        self.terrain_seed = random.getrandbits(32)
         log(f"Initializing PlanetSurface for Level {self.level}")
         self.update_ground_layers()
         self.generate_features()
@@ -360,60 +955,116 @@ class PlanetSurface:
     def update_ground_layers(self):
         try:
             planet_type = (self.level - 1) % 20
-            log(f"Updating ground layers for Level {self.level}, planet_type {planet_type}")
+            log(f"Updating ground layers for Level {self.level}, planet_type {planet_type}", LOG_DEBUG, every=1)
             self.ground_layers = []
             if planet_type < 5:  # Levels 1-5: Desert range
                 self.ground_layers.append({"type": "earth", "color": (200, 100, 50), "height": HEIGHT * 3})  # Rusty orange
-                log(f"Set rusty orange for Level {self.level}")
+                log(f"Set rusty orange for Level {self.level}", LOG_DEBUG, every=1)
             elif planet_type < 10:  # Levels 6-10: Grass range
                 self.ground_layers.append({"type": "earth", "color": (50, 150, 50), "height": HEIGHT * 3})  # Vibrant green
-                log(f"Set vibrant green for Level {self.level}")
+                log(f"Set vibrant green for Level {self.level}", LOG_DEBUG, every=1)
             elif planet_type < 15:  # Levels 11-15: Rocky range
                 self.ground_layers.append({"type": "earth", "color": (80, 60, 60), "height": HEIGHT * 3})  # Dark reddish-brown
-                log(f"Set dark reddish-brown for Level {self.level}")
+                log(f"Set dark reddish-brown for Level {self.level}", LOG_DEBUG, every=1)
             else:  # Levels 16-20: Mixed range
                 self.ground_layers.append({"type": "earth", "color": (120, 80, 40), "height": HEIGHT * 3})  # Warm brown
-                log(f"Set warm brown for Level {self.level}")
-            log(f"Ground layers updated: {[(l['type'], l['color']) for l in self.ground_layers]}")
+                log(f"Set warm brown for Level {self.level}", LOG_DEBUG, every=1)
+            log(f"Ground layers updated: {[(l['type'], l['color']) for l in self.ground_layers]}", LOG_DEBUG, every=1)
         except Exception as e:
-            log(f"Ground layers update failed for Level {self.level}: {e}")
+            log(f"Ground layers update failed for Level {self.level}: {e}", LOG_ERROR, every=1)
             self.ground_layers.append({"type": "earth", "color": (200, 100, 50), "height": HEIGHT * 3})  # Fallback
 
     def generate_features(self):
         try:
+            rng = random.Random(self.terrain_seed)
             for _ in range(50):
-                x = random.randint(0, WIDTH)
-                y = random.randint(0, HEIGHT * 4)
-                feature_roll = random.random()
+                x = rng.randint(0, WIDTH)
+                y = rng.randint(0, HEIGHT * 4)
+                feature_roll = rng.random()
                 if feature_roll < 0.6:
-                    width = random.randint(20, 60)
-                    height = random.randint(15, 40)
-                    self.features.append({"type": "forest", "x": x, "y": y, "width": width, "height": height, "offset": random.randint(-3, 3)})
+                    width = rng.randint(20, 60)
+                    height = rng.randint(15, 40)
+                    self.features.append({"type": "forest", "x": x, "y": y, "width": width, "height": height, "offset": rng.randint(-3, 3)})
                 elif feature_roll < 0.9:
-                    width = random.randint(40, 80)
-                    height = random.randint(10, 25)
-                    self.features.append({"type": "river", "x": x, "y": y, "width": width, "height": height, "offset": random.randint(-3, 3)})
+                    width = rng.randint(40, 80)
+                    height = rng.randint(10, 25)
+                    self.features.append({"type": "river", "x": x, "y": y, "width": width, "height": height, "offset": rng.randint(-3, 3)})
                 else:
-                    width = random.randint(20, 50)
-                    height = random.randint(10, 30)
-                    self.features.append({"type": "earth", "x": x, "y": y, "width": width, "height": height, "offset": random.randint(-3, 3)})
+                    width = rng.randint(20, 50)
+                    height = rng.randint(10, 30)
+                    self.features.append({"type": "earth", "x": x, "y": y, "width": width, "height": height, "offset": rng.randint(-3, 3)})
         except Exception as e:
-            log(f"Feature generation failed: {e}")
+            log(f"Feature generation failed: {e}", LOG_ERROR)
 
     def generate_bases(self):
         try:
+            rng = random.Random(self.terrain_seed ^ 0x5EED)
             for _ in range(5):
-                x = random.randint(0, WIDTH - 25)
-                y = random.randint(0, HEIGHT * 4)
-                base_type = random.choice(["circle", "rect", "diamond"])
-                size = random.randint(10, 20)
-                self.bases.append({"type": base_type, "x": x, "y": y, "size": size, "offset": random.randint(-3, 3)})
+                x = rng.randint(0, WIDTH - 25)
+                y = rng.randint(0, HEIGHT * 4)
+                base_type = rng.choice(["circle", "rect", "diamond"])
+                size = rng.randint(10, 20)
+                self.bases.append({"type": base_type, "x": x, "y": y, "size": size, "offset": rng.randint(-3, 3)})
         except Exception as e:
-            log(f"Base generation failed: {e}")
+            log(f"Base generation failed: {e}", LOG_ERROR)
+
+    def terrain_tile(self, index):
+        key = (self.terrain_seed, index)
+        tile = terrain_tiles.get(key)
+        if tile is not None:
+            terrain_tiles.move_to_end(key)
+            return tile
+        tile = pygame.Surface((WIDTH, TERRAIN_TILE_HEIGHT + TERRAIN_TILE_MARGIN * 2)).convert()
+        tile.fill(TERRAIN_COLORKEY)
+        top = index * TERRAIN_TILE_HEIGHT - TERRAIN_TILE_MARGIN
+        bottom = TERRAIN_TILE_HEIGHT + TERRAIN_TILE_MARGIN * 2
+        # Anything within a base/feature's height of the tile (including across the world wrap) is drawn into it
+        for feature in self.features:
+            for wrap in (-TERRAIN_WORLD_HEIGHT, 0, TERRAIN_WORLD_HEIGHT):
+                y_pos = feature["y"] + feature["offset"] + wrap - top
+                if y_pos > bottom or y_pos + feature["height"] + 1 < 0:
+                    continue
+                if feature["type"] == "forest":
+                    pygame.draw.rect(tile, (30, 100, 30), (feature["x"], y_pos, feature["width"], feature["height"]))
+                    pygame.draw.rect(tile, (0, 50, 0), (feature["x"] + 1, y_pos + 1, feature["width"], feature["height"]), 1)
+                elif feature["type"] == "river":
+                    pygame.draw.rect(tile, (0, 120, 180), (feature["x"], y_pos, feature["width"], feature["height"]))
+                    pygame.draw.rect(tile, (0, 50, 100), (feature["x"] + 1, y_pos + 1, feature["width"], feature["height"]), 1)
+                elif feature["type"] == "earth":
+                    pygame.draw.rect(tile, (150, 90, 40), (feature["x"], y_pos, feature["width"], feature["height"]))
+                    pygame.draw.rect(tile, (100, 60, 20), (feature["x"] + 1, y_pos + 1, feature["width"], feature["height"]), 1)
+        for base in self.bases:
+            for wrap in (-TERRAIN_WORLD_HEIGHT, 0, TERRAIN_WORLD_HEIGHT):
+                y_pos = base["y"] + base["offset"] + wrap - top
+                if y_pos > bottom or y_pos + base["size"] + 1 < 0:
+                    continue
+                if base["type"] == "circle":
+                    pygame.draw.circle(tile, (255, 69, 0), (int(base["x"] + base["size"] // 2), int(y_pos + base["size"] // 2)), base["size"] // 2)
+                    pygame.draw.circle(tile, (255, 255, 255), (int(base["x"] + base["size"] // 2), int(y_pos + base["size"] // 2)), base["size"] // 4, 1)
+                    pygame.draw.circle(tile, (200, 0, 0), (int(base["x"] + base["size"] // 2 + 1), int(y_pos + base["size"] // 2 + 1)), base["size"] // 2, 1)
+                elif base["type"] == "rect":
+                    pygame.draw.rect(tile, (139, 69, 19), (base["x"], y_pos, base["size"], base["size"]))
+                    pygame.draw.rect(tile, (100, 50, 0), (base["x"] + 1, y_pos + 1, base["size"], base["size"]), 1)
+                elif base["type"] == "diamond":
+                    points = [(base["x"] + base["size"] // 2, y_pos), 
+                              (base["x"] + base["size"], y_pos + base["size"] // 2), 
+                              (base["x"] + base["size"] // 2, y_pos + base["size"]), 
+                              (base["x"], y_pos + base["size"] // 2)]
+                    pygame.draw.polygon(tile, (255, 100, 0), points)
+                    shadow_points = [(p[0] + 1, p[1] + 1) for p in points]
+                    pygame.draw.polygon(tile, (200, 0, 0), shadow_points, 1)
+        tile = tile.subsurface((0, TERRAIN_TILE_MARGIN, WIDTH, TERRAIN_TILE_HEIGHT)).copy()
+        tile.set_colorkey(TERRAIN_COLORKEY, pygame.RLEACCEL)
+        tile = terrain_tiles[key] = world_sprite(tile)
+        if len(terrain_tiles) > TERRAIN_TILE_CACHE_SIZE:
+            terrain_tiles.popitem(last=False)
+        log(f"Built terrain tile {index} for Level {self.level}", LOG_DEBUG)
+        return tile
 
     def generate_nebulae(self):
         try:
             self.nebulae = []
+            rng = np.random.default_rng(random.getrandbits(32))
             for _ in range(3):
                 x = random.randint(0, WIDTH)
                 y = random.randint(0, HEIGHT * 2)
@@ -421,43 +1072,37 @@ class PlanetSurface:
                 base_height = random.randint(80, 150)
                 speed = random.uniform(0.2, 0.5)
                 nebula_surf = pygame.Surface((base_width, base_height), pygame.SRCALPHA)
-                colors = [(ORANGE, 40), (NEON_PINK, 35), (NEON_BLUE, 30), (NEON_GREEN, 25)]  # Subtle opacity
                 for _ in range(5):
-                    oval_width = random.randint(20, 60)
-                    oval_height = random.randint(20, 80)
+                    oval_width = nebula_bucket(random.randint(20, 60), NEBULA_SIZE_STEP)
+                    oval_height = nebula_bucket(random.randint(20, 80), NEBULA_SIZE_STEP)
                     offset_x = random.randint(-base_width // 4, base_width // 4)
                     offset_y = random.randint(-base_height // 4, base_height // 4)
                     angle = random.uniform(0, 360)
-                    color = random.choice(colors)
-                    oval_surf = pygame.Surface((oval_width * 2, oval_height * 2), pygame.SRCALPHA)
-                    for px in range(oval_width * 2):
-                        for py in range(oval_height * 2):
-                            center_x, center_y = oval_width, oval_height
-                            dist_x = (px - center_x) / oval_width
-                            dist_y = (py - center_y) / oval_height
-                            dist = math.hypot(dist_x, dist_y)
-                            if dist <= 1:
-                                alpha = int(color[1] * (1 - dist * 0.9))
-                                if alpha > 0:
-                                    oval_surf.set_at((px, py), (*color[0][:3], alpha))
-                    oval_surf = pygame.transform.rotate(oval_surf, angle)
-                    nebula_surf.blit(oval_surf, (base_width // 2 + offset_x - oval_width, 
-                                               base_height // 2 + offset_y - oval_height))
-                for px in range(0, base_width, 8):
-                    for py in range(0, base_height, 8):
-                        if random.random() < 0.1:  # Sparse dither
-                            alpha = random.randint(10, 20)
-                            nebula_surf.set_at((px, py), (*random.choice([ORANGE, NEON_PINK, NEON_BLUE, NEON_GREEN])[:3], alpha))
-                self.nebulae.append([x, y, nebula_surf, speed])
+                    color = random.choice(NEBULA_COLORS)
+                    oval_surf, crop_x, crop_y = nebula_oval_stamp(color, oval_width, oval_height, angle)
+                    nebula_surf.blit(oval_surf, (base_width // 2 + offset_x - oval_width + crop_x,
+                                               base_height // 2 + offset_y - oval_height + crop_y))
+                # Sparse dither: 10% of the points on an 8px grid get a faint neon speck
+                rows = (base_height + 7) // 8
+                specks = np.flatnonzero(rng.random(((base_width + 7) // 8) * rows) < 0.1)
+                px, py = specks // rows * 8, specks % rows * 8
+                rgb = pygame.surfarray.pixels3d(nebula_surf)
+                rgb[px, py] = NEBULA_DITHER_RGB[rng.integers(0, len(NEBULA_DITHER_RGB), len(px))]
+                del rgb
+                alpha = pygame.surfarray.pixels_alpha(nebula_surf)
+                alpha[px, py] = rng.integers(10, 21, len(px))
+                del alpha
+                self.nebulae.append([x, y, nebula_surf, speed, world_sprite(nebula_surf)])
         except Exception as e:
-            log(f"Nebulae generation failed: {e}")
+            log(f"Nebulae generation failed: {e}", LOG_ERROR)
 
     def move(self):
-        log(f"Moving PlanetSurface for Level {self.level}, offset_y was {self.offset_y}")
+        log(f"Moving PlanetSurface for Level {self.level}, offset_y was {self.offset_y}", LOG_DEBUG, every=1)
         try:
             self.offset_y += 1
             if self.offset_y >= HEIGHT * 2:
                 self.offset_y = 0
+                self.terrain_seed = random.getrandbits(32)
                 self.ground_layers = []
                 self.features = []
                 self.bases = []
@@ -469,22 +1114,11 @@ class PlanetSurface:
                 self.generate_nebulae()
                 log(f"PlanetSurface reset for Level {self.level}")
 
-            meteors_to_remove = []
             for meteor in self.meteors:
-                meteor[1] += meteor[3]
-                if meteor[1] > HEIGHT:
-                    meteors_to_remove.append(meteor)
-                global player_x, player_y, player_size, player_health
-                meteor_size = 20
-                if (meteor[1] + meteor_size > player_y and meteor[1] < player_y + player_size and 
-                    meteor[0] + meteor_size > player_x and meteor[0] < player_x + player_size):
-                    player_health -= 25
-                    if ship_hit_sound: ship_hit_sound.play()
-                    meteors_to_remove.append(meteor)
-
-            for meteor in meteors_to_remove:
-                if meteor in self.meteors:
-                    self.meteors.remove(meteor)
+                meteor.y += meteor.speed
+                if meteor.y > HEIGHT:
+                    meteor.dead = True
+            compact_entities(self.meteors)
 
             for nebula in self.nebulae:
                 nebula[1] += nebula[3]
@@ -495,116 +1129,278 @@ class PlanetSurface:
             if self.level > 1 and random.random() < 0.01 and not self.meteor_active:
                 self.meteor_active = True
                 self.meteor_timer = 300
-                for _ in range(2):
-                    meteor_x = random.randint(0, WIDTH - meteor_size)
-                    meteor_y = -20
-                    meteor_speed = random.uniform(3, 6)
-                    self.meteors.append([meteor_x, meteor_y, 0, meteor_speed])
 
             if self.meteor_active:
                 self.meteor_timer -= 1
                 if self.meteor_timer <= 0:
                     self.meteor_active = False
                     self.meteors = []
-                elif random.random() < 0.05:
-                    meteor_x = random.randint(0, WIDTH - meteor_size)
-                    meteor_y = -20
-                    meteor_speed = random.uniform(3, 6)
-                    self.meteors.append([meteor_x, meteor_y, 0, meteor_speed])
         except Exception as e:
-            log(f"Planet move failed for Level {self.level}: {e}")
+            log(f"Planet move failed for Level {self.level}: {e}", LOG_ERROR, every=1)
 
-    def draw(self, screen):
-        log(f"Drawing PlanetSurface for Level {self.level} at offset_y {self.offset_y}")
+    def draw(self, screen, alpha=1.0):
+        log(f"Drawing PlanetSurface for Level {self.level} at offset_y {self.offset_y}", LOG_DEBUG, every=1)
         try:
-            self.update_ground_layers()
+            offset_y = self.offset_y - (1 - alpha)  # The surface scrolls 1px per step
             y_offset = 0
             for layer in self.ground_layers:
-                pygame.draw.rect(screen, layer["color"], (0, y_offset - self.offset_y - HEIGHT * 2, WIDTH, layer["height"]))
+                pygame.draw.rect(screen, layer["color"], world_rect(0, y_offset - offset_y - HEIGHT * 2, WIDTH, layer["height"]))
                 darker = (max(0, layer["color"][0] - 30), max(0, layer["color"][1] - 30), max(0, layer["color"][2] - 30))
-                pygame.draw.rect(screen, darker, (0, y_offset - self.offset_y + layer["height"] - HEIGHT * 2 - 3, WIDTH, 3))
+                pygame.draw.rect(screen, darker, world_rect(0, y_offset - offset_y + layer["height"] - HEIGHT * 2 - 3, WIDTH, 3))
                 y_offset += layer["height"]
 
             for nebula in self.nebulae:
-                x, y, nebula_surf, _ = nebula
-                y_pos = (y - self.offset_y) % (HEIGHT * 2) - HEIGHT
-                screen.blit(nebula_surf, (x - nebula_surf.get_width() // 2, y_pos))
-
-            for feature in self.features:
-                y_pos = (feature["y"] - self.offset_y) % (HEIGHT * 4) - HEIGHT * 2 + feature["offset"]
-                if feature["type"] == "forest":
-                    pygame.draw.rect(screen, (30, 100, 30), (feature["x"], y_pos, feature["width"], feature["height"]))
-                    pygame.draw.rect(screen, (0, 50, 0, 80), (feature["x"] + 1, y_pos + 1, feature["width"], feature["height"]), 1)
-                elif feature["type"] == "river":
-                    pygame.draw.rect(screen, (0, 120, 180), (feature["x"], y_pos, feature["width"], feature["height"]))
-                    pygame.draw.rect(screen, (0, 50, 100, 80), (feature["x"] + 1, y_pos + 1, feature["width"], feature["height"]), 1)
-                elif feature["type"] == "earth":
-                    pygame.draw.rect(screen, (150, 90, 40), (feature["x"], y_pos, feature["width"], feature["height"]))
-                    pygame.draw.rect(screen, (100, 60, 20, 80), (feature["x"] + 1, y_pos + 1, feature["width"], feature["height"]), 1)
-
-            for base in self.bases:
-                y_pos = (base["y"] - self.offset_y) % (HEIGHT * 4) - HEIGHT * 2 + base["offset"]
-                if base["type"] == "circle":
-                    pygame.draw.circle(screen, (255, 69, 0), (int(base["x"] + base["size"] // 2), int(y_pos + base["size"] // 2)), base["size"] // 2)
-                    pygame.draw.circle(screen, (255, 255, 255), (int(base["x"] + base["size"] // 2), int(y_pos + base["size"] // 2)), base["size"] // 4, 1)
-                    pygame.draw.circle(screen, (200, 0, 0, 60), (int(base["x"] + base["size"] // 2 + 1), int(y_pos + base["size"] // 2 + 1)), base["size"] // 2, 1)
-                elif base["type"] == "rect":
-                    pygame.draw.rect(screen, (139, 69, 19), (base["x"], y_pos, base["size"], base["size"]))
-                    pygame.draw.rect(screen, (100, 50, 0, 60), (base["x"] + 1, y_pos + 1, base["size"], base["size"]), 1)
-                elif base["type"] == "diamond":
-                    points = [(base["x"] + base["size"] // 2, y_pos), 
-                              (base["x"] + base["size"], y_pos + base["size"] // 2), 
-                              (base["x"] + base["size"] // 2, y_pos + base["size"]), 
-                              (base["x"], y_pos + base["size"] // 2)]
-                    pygame.draw.polygon(screen, (255, 100, 0), points)
-                    shadow_points = [(p[0] + 1, p[1] + 1) for p in points]
-                    pygame.draw.polygon(screen, (200, 0, 0, 60), shadow_points, 1)
+                x, y, nebula_surf, speed, world_surf = nebula
+                y_pos = (y - speed * (1 - alpha) - offset_y) % (HEIGHT * 2) - HEIGHT
+                screen.blit(world_surf, ((x - nebula_surf.get_width() // 2) * RENDER_SCALE, y_pos * RENDER_SCALE))
+
+            # Screen row 0 shows world row offset_y + 2H; blit the two or three tiles covering the screen
+            world_y = int(offset_y + HEIGHT * 2) % TERRAIN_WORLD_HEIGHT
+            tile_index, tile_y = divmod(world_y, TERRAIN_TILE_HEIGHT)
+            screen_y = -tile_y
+            tile_count = TERRAIN_WORLD_HEIGHT // TERRAIN_TILE_HEIGHT
+            while screen_y < HEIGHT:
+                screen.blit(self.terrain_tile(tile_index % tile_count), (0, screen_y * RENDER_SCALE))
+                tile_index += 1
+                screen_y += TERRAIN_TILE_HEIGHT
 
             for meteor in self.meteors:
-                meteor_x, meteor_y = meteor[0], meteor[1]
-                pygame.draw.circle(screen, (150, 75, 0), (int(meteor_x + 10), int(meteor_y + 10)), 10)
-                pygame.draw.circle(screen, (255, 165, 0), (int(meteor_x + 10), int(meteor_y + 10)), 12, 1)
-            log(f"Drew PlanetSurface successfully for Level {self.level}")
+                meteor_x, meteor_y = meteor.x, meteor.y - meteor.speed * (1 - alpha)
+                center = (int((meteor_x + 10) * RENDER_SCALE), int((meteor_y + 10) * RENDER_SCALE))
+                pygame.draw.circle(screen, (150, 75, 0), center, round(10 * RENDER_SCALE))
+                pygame.draw.circle(screen, (255, 165, 0), center, round(12 * RENDER_SCALE), 1)
+            log(f"Drew PlanetSurface successfully for Level {self.level}", LOG_DEBUG, every=1)
         except Exception as e:
-            log(f"Planet draw failed for Level {self.level}: {e}")
+            log(f"Planet draw failed for Level {self.level}: {e}", LOG_ERROR, every=1)
 
 def generate_background(level):
     global stars, planet_surface
     try:
-        star_count = 100 if level == 1 else 0  # Stars for Level 1, planet for 2+
-        stars = [Star(level) for _ in range(star_count)]
+        stars = Starfield(level) if level == 1 else None  # Stars for Level 1, planet for 2+
         planet_surface = PlanetSurface(level)
-        log(f"Generated background for Level {level}: {star_count} stars")
+        log(f"Generated background for Level {level}: {len(stars) if stars else 0} stars")
         play_music_for_level(level)
     except Exception as e:
-        log(f"Background generation failed: {e}")
-        stars = []
+        log(f"Background generation failed: {e}", LOG_ERROR)
+        stars = None
         planet_surface = PlanetSurface(1)
 
-def draw_glow(surface, x, y, size, color, is_enemy=False):
-    try:
-        if is_enemy:
-            color = random.choice([YELLOW, ORANGE, NEON_PINK, NEON_BLUE, NEON_GREEN, CYAN, PURPLE])
-        if not isinstance(color, tuple) or len(color) < 3:
-            log(f"Invalid color detected: {color}, defaulting to WHITE")
-            color = WHITE
-        
-        for i in range(3):
+ENEMY_GLOW_COLORS = [YELLOW, ORANGE, NEON_PINK, NEON_BLUE, NEON_GREEN, CYAN, PURPLE]
+GLOW_LAYERS = 3
+GLOW_MARGIN = GLOW_LAYERS * 6 // 2  # The outermost layer extends this far past the sprite on each side
+glow_sprites = {}  # (size, color) -> (the three glow layers pre-composited into one surface, the same sized for the world surface)
+fx_random = random.Random()  # Drawing and sound randomness, kept off the gameplay stream so recorded inputs replay the same game
+
+def glow_sprite(size, color):
+    key = (size, color)
+    entry = glow_sprites.get(key)
+    if entry is None:
+        r, g, b = [max(0, min(255, c)) for c in color[:3]]
+        sprite = pygame.Surface((size + GLOW_MARGIN * 2, size + GLOW_MARGIN * 2), pygame.SRCALPHA)
+        for i in range(GLOW_LAYERS):
             glow_size = size + (i + 1) * 6
             alpha = max(0, min(255, 20 - i * 5))
             glow_surf = pygame.Surface((glow_size, glow_size), pygame.SRCALPHA)
-            r, g, b = [max(0, min(255, c)) for c in color[:3]]
             pygame.draw.rect(glow_surf, (r, g, b, alpha), (0, 0, glow_size, glow_size), border_radius=size // 2)
-            surface.blit(glow_surf, (x - (glow_size - size) // 2, y - (glow_size - size) // 2))
+            offset = GLOW_MARGIN - (glow_size - size) // 2
+            sprite.blit(glow_surf, (offset, offset))
+        entry = glow_sprites[key] = (sprite, world_sprite(sprite))
+    return entry
+
+def glow_color(color, is_enemy):
+    # Enemies flicker between the cached palette variants
+    if is_enemy:
+        return fx_random.choice(ENEMY_GLOW_COLORS)
+    if not isinstance(color, tuple) or len(color) < 3:
+        log(f"Invalid color detected: {color}, defaulting to WHITE", LOG_WARNING, every=1)
+        return WHITE
+    return color
+
+def glow_blit_item(x, y, size, color, is_enemy=False):
+    # Surface.blits() entry for one entity's glow on the world surface
+    return (glow_sprite(size, glow_color(color, is_enemy))[1], ((x - GLOW_MARGIN) * RENDER_SCALE, (y - GLOW_MARGIN) * RENDER_SCALE))
+
+def draw_glow(surface, x, y, size, color, is_enemy=False):
+    try:
+        surface.blit(glow_sprite(size, glow_color(color, is_enemy))[0], (x - GLOW_MARGIN, y - GLOW_MARGIN))
     except Exception as e:
-        log(f"Glow draw failed: {e}")
+        log(f"Glow draw failed: {e}", LOG_ERROR, every=1)
+
+ROTATION_STEP = 2  # Degrees; rotated sprites are cached per step, per source frame
+rotated_sprites = {}  # (sprite, angle bucket) -> (rotated sprite sized for the world surface, half width, half height)
+
+def rotated_sprite(sprite, angle):
+    key = (sprite, int(round(angle / ROTATION_STEP)) * ROTATION_STEP % 360)
+    entry = rotated_sprites.get(key)
+    if entry is None:
+        rotated = world_sprite(pygame.transform.rotate(sprite, key[1]))
+        entry = (rotated, rotated.get_width() // 2, rotated.get_height() // 2)
+        rotated_sprites[key] = entry
+    return entry
+
+PROJECTILE_ANGLE_STEPS = 72  # 5 degree buckets
+ENEMY_SHOT_LIFETIME = 120
+ENEMY_SHOT_ALPHA_STEPS = 8  # Enemy shots fade over their lifetime in this many steps
+PLAYER_SHOT_COLORS = (YELLOW, ORANGE)
+BUDDY_SHOT_COLORS = (NEON_GREEN, CYAN)
+projectile_sprites = {}  # key -> (surface sized for the world surface, anchor x, anchor y); the anchor sits on the shot's position
+
+def projectile_angle_index(dx, dy):
+    return round(math.degrees(math.atan2(dy, dx)) * PROJECTILE_ANGLE_STEPS / 360) % PROJECTILE_ANGLE_STEPS
+
+def enemy_shot_alpha_index(lifetime):
+    return max(0, min(ENEMY_SHOT_ALPHA_STEPS - 1, math.ceil(lifetime * ENEMY_SHOT_ALPHA_STEPS / ENEMY_SHOT_LIFETIME) - 1))
+
+def enemy_shot_sprite(angle_index, alpha_index):
+    key = ("enemy", angle_index, alpha_index)
+    entry = projectile_sprites.get(key)
+    if entry is None:
+        fade = (alpha_index + 1) / ENEMY_SHOT_ALPHA_STEPS
+        gradient_surf = pygame.Surface((enemy_shot_length * 2, enemy_shot_width * 3), pygame.SRCALPHA)
+        for i in range(enemy_shot_length):
+            alpha = int(255 * fade * (1 - i / enemy_shot_length))
+            pygame.draw.line(gradient_surf, (255, 0, 0, alpha), (i * 2, 0), (i * 2, enemy_shot_width * 3))
+            if i > enemy_shot_length // 4 and i < enemy_shot_length * 3 // 4:
+                core_alpha = int(255 * fade)
+                pygame.draw.line(gradient_surf, (255, 255, 255, core_alpha), (i * 2, enemy_shot_width), (i * 2, enemy_shot_width * 2))
+        gradient_surf = world_sprite(pygame.transform.rotate(gradient_surf, -angle_index * 360 / PROJECTILE_ANGLE_STEPS))
+        entry = (gradient_surf, gradient_surf.get_width() // 2, gradient_surf.get_height() // 2)
+        projectile_sprites[key] = entry
+    return entry
+
+def enemy_shot_glow_sprite():
+    glow_surf = projectile_sprites.get("enemy_glow")
+    if glow_surf is None:
+        glow_surf = pygame.Surface((enemy_shot_width * 6, enemy_shot_width * 6), pygame.SRCALPHA)
+        pygame.draw.circle(glow_surf, (255, 0, 0, 100), (enemy_shot_width * 3, enemy_shot_width * 3), enemy_shot_width * 3)
+        glow_surf = projectile_sprites["enemy_glow"] = world_sprite(glow_surf)
+    return glow_surf
+
+def shot_trail_sprite(colors, dx, dy):
+    angle_index = projectile_angle_index(dx, dy)
+    length = round(math.hypot(dx, dy))
+    key = (colors, angle_index, length)
+    entry = projectile_sprites.get(key)
+    if entry is None:
+        angle = math.radians(angle_index * 360 / PROJECTILE_ANGLE_STEPS)
+        end_x, end_y = math.cos(angle) * length, math.sin(angle) * length
+        anchor_x = shot_width + math.ceil(max(0, -end_x))
+        anchor_y = shot_width + math.ceil(max(0, -end_y))
+        trail = pygame.Surface((math.ceil(abs(end_x)) + shot_width * 2 + 1, math.ceil(abs(end_y)) + shot_width * 2 + 1), pygame.SRCALPHA)
+        mid = (anchor_x + end_x * 0.5, anchor_y + end_y * 0.5)
+        pygame.draw.line(trail, colors[0], (anchor_x, anchor_y), mid, shot_width)
+        pygame.draw.line(trail, colors[1], mid, (anchor_x + end_x, anchor_y + end_y), shot_width - 1)
+        entry = (world_sprite(trail), anchor_x * RENDER_SCALE, anchor_y * RENDER_SCALE)
+        projectile_sprites[key] = entry
+    return entry
+
+def build_projectile_sprites():
+    # Every enemy shot angle/fade pair plus the player and wingman trails at their two speeds
+    # (straight shots and the +/-5 piercing splits); anything else is built on first use.
+    for angle_index in range(PROJECTILE_ANGLE_STEPS):
+        for alpha_index in range(ENEMY_SHOT_ALPHA_STEPS):
+            enemy_shot_sprite(angle_index, alpha_index)
+        angle = math.radians(angle_index * 360 / PROJECTILE_ANGLE_STEPS)
+        for speed in (abs(shot_speed), math.hypot(5, shot_speed)):
+            for colors in (PLAYER_SHOT_COLORS, BUDDY_SHOT_COLORS):
+                shot_trail_sprite(colors, math.cos(angle) * speed, math.sin(angle) * speed)
+    enemy_shot_glow_sprite()
+    return len(projectile_sprites)
+
+HUD_GLYPHS = "0123456789/-."
+HUD_STATS_SIZE = (WIDTH // 3, 290)
+HUD_BOSS_SIZE = (210, 50)
+
+class HudLayer:
+    def __init__(self):
+        self.labels = {}  # (text, color) -> rendered label
+        self.glyph_atlases = {}  # color -> (strip of HUD_GLYPHS, {character: (cell rect, advance)})
+        self.panels = {}  # name -> (values it was built from, composited surface)
+
+    def label(self, text, color=WHITE):
+        surface = self.labels.get((text, color))
+        if surface is None:
+            surface = font.render(text, True, color)
+            self.labels[(text, color)] = surface
+        return surface
+
+    def glyph_atlas(self, color):
+        atlas = self.glyph_atlases.get(color)
+        if atlas is None:
+            glyphs = [font.render(c, True, color) for c in HUD_GLYPHS]
+            cell_width = max(glyph.get_width() for glyph in glyphs)
+            strip = pygame.Surface((cell_width * len(glyphs), font.get_height()), pygame.SRCALPHA)
+            strip.fill((*color[:3], 0))
+            cells = {}
+            for i, (c, glyph) in enumerate(zip(HUD_GLYPHS, glyphs)):
+                strip.blit(glyph, (i * cell_width, 0))
+                cells[c] = (pygame.Rect(i * cell_width, 0, glyph.get_width(), glyph.get_height()), font.size(c)[0])
+            atlas = (strip, cells)
+            self.glyph_atlases[color] = atlas
+        return atlas
+
+    def field_items(self, label, value, x, y, color=WHITE):
+        # Static label from the cache, then the value stamped digit by digit from the glyph atlas
+        text = str(value)
+        strip, cells = self.glyph_atlas(color)
+        if not all(c in cells for c in text):
+            return [(self.label(label + text, color), (x, y))]
+        label_surface = self.label(label, color)
+        items = [(label_surface, (x, y))]
+        x += label_surface.get_width()
+        for c in text:
+            rect, advance = cells[c]
+            items.append((strip, (x, y), rect))
+            x += advance
+        return items
+
+    def panel(self, name, values, size):
+        cached = self.panels.get(name)
+        if cached and cached[0] == values:
+            return None, cached[1]
+        surface = pygame.Surface(size, pygame.SRCALPHA)
+        surface.fill((*WHITE[:3], 0))  # Transparent white, so white text edges blend exactly as they would onto the screen
+        self.panels[name] = (values, surface)
+        return surface, surface
+
+    def stats_panel(self, score, high, divers, level, health, max_health, kill_streak, best_streak, capture_streak, best_capture):
+        values = (score, high, divers, level, health, max_health, kill_streak, best_streak, capture_streak, best_capture)
+        surface, panel = self.panel("stats", values, HUD_STATS_SIZE)
+        if surface:
+            items = []
+            items.extend(self.field_items("Points: ", score, 10, 10))
+            items.extend(self.field_items("High: ", high, 10, 40))
+            items.extend(self.field_items("Divers Rescued: ", divers, 10, 70))
+            items.extend(self.field_items("Level: ", level, 10, 100))
+            items.extend(self.field_items("HP: ", f"{health}/{max_health}", 10, 145))
+            items.extend(self.field_items("Kill Streak: ", kill_streak, 10, 175))
+            items.extend(self.field_items("Best Streak: ", best_streak, 10, 205))
+            items.extend(self.field_items("Capture Streak: ", capture_streak, 10, 235))
+            items.extend(self.field_items("Best Capture: ", best_capture, 10, 265))
+            pygame.draw.rect(surface, RED, (10, 130, 100, 10))
+            pygame.draw.rect(surface, GREEN, (10, 130, 100 * (health / max_health), 10))
+            surface.blits(items, doreturn=False)
+        return panel
+
+    def boss_panel(self, health, max_health):
+        surface, panel = self.panel("boss", (health, max_health), HUD_BOSS_SIZE)
+        if surface:
+            pygame.draw.rect(surface, RED, (0, 0, 200, 20))
+            pygame.draw.rect(surface, GREEN, (0, 0, 200 * (health / max_health), 20))
+            surface.blits(self.field_items("Boss HP: ", f"{health}/{max_health}", 0, 25), doreturn=False)
+        return panel
+
+hud = HudLayer()
 
 def play_intro():
-    global first_level_1_start, joystick
+    global first_level_1_start, joystick, intro_music
     try:
+        intro_music = assets.get("intro_music_sound")
         if intro_music:
+            intro_music.set_volume(0.2)
             intro_music.play()
-        for frame in intro_frames:
+        for i in range(1, INTRO_FRAME_COUNT + 1):
+            frame = assets.get(f"intro{i}")  # Later frames keep decoding while earlier ones are on screen
             screen.blit(frame, (0, 0))
             pygame.display.flip()
             pygame.time.wait(750)
@@ -622,13 +1418,22 @@ def play_intro():
         intro_music.stop()
         return True
     except Exception as e:
-        log(f"Intro playback failed: {e}")
+        log(f"Intro playback failed: {e}", LOG_ERROR)
         return True
 
+MENU_FPS = 30  # Menus only redraw when something changes, and poll input at this rate
+
+def menu_layer(overlay=None):
+    layer = pygame.Surface((WIDTH, HEIGHT)).convert()
+    layer.blit(start_screen_sprite, (0, 0))
+    if overlay:
+        layer.blit(overlay, (0, 0))
+    return layer
+
 def start_screen():
     global level, base_level, joystick
+    bind_title_assets()
     selected_level = 1
-    screen.blit(start_screen_sprite, (0, 0))
     power_up_items = [
         (power_up_sprites["rate"], "Rate of Fire: Faster Shots"),
         (power_up_sprites["reinforce"], "Reinforce: +100 HP"),
@@ -665,36 +1470,42 @@ def start_screen():
     else:
         joystick = None
 
+    layer = menu_layer()
+    high_score_text = font.render(f"High Score: {high_score}", True, WHITE)
+    layer.blit(high_score_text, (WIDTH // 2 - high_score_text.get_width() // 2, 10))
+    layer.blit(font.render("Power-Ups", True, WHITE), (50, 50))
+    for i, (sprite, text) in enumerate(power_up_items):
+        y_pos = 80 + i * 40
+        draw_glow(layer, 50 - 5, y_pos - 5, power_up_size, WHITE)
+        layer.blit(sprite, (50, y_pos))
+        layer.blit(font.render(text, True, WHITE), (80, y_pos + 5))
+    layer.blit(font.render("Enemies", True, WHITE), (400, 50))
+    for i, (sprite, text) in enumerate(enemy_items):
+        y_pos = 80 + i * 40
+        draw_glow(layer, 400 - 5, y_pos - 5, alien_size, YELLOW)
+        layer.blit(sprite, (400, y_pos))
+        layer.blit(font.render(text, True, WHITE), (435, y_pos + 5))
+    layer.blit(font.render("Select Starting Level (1-20):", True, WHITE), (400, 300))
+    layer.blit(font.render("Press Space / Cross to Start", True, WHITE), (400 + 50, 360))
+    layer.blit(font.render("Controls", True, WHITE), (550, 50))
+    for i, (key, action) in enumerate(controls):
+        y_pos = 80 + i * 40
+        draw_glow(layer, 550 - 5, y_pos - 5, 20, BLUE)
+        key_text = font.render(key, True, WHITE)
+        action_text = font.render(action, True, WHITE)
+        layer.blit(key_text, (550, y_pos + 5))
+        layer.blit(action_text, (600 + key_text.get_width(), y_pos + 5))
+    drawn_level = None
+
     while True:
         try:
-            screen.blit(start_screen_sprite, (0, 0))
-            high_score_text = font.render(f"High Score: {high_score}", True, WHITE)
-            screen.blit(high_score_text, (WIDTH // 2 - high_score_text.get_width() // 2, 10))
-            screen.blit(font.render("Power-Ups", True, WHITE), (50, 50))
-            for i, (sprite, text) in enumerate(power_up_items):
-                y_pos = 80 + i * 40
-                draw_glow(screen, 50 - 5, y_pos - 5, power_up_size, WHITE)
-                screen.blit(sprite, (50, y_pos))
-                screen.blit(font.render(text, True, WHITE), (80, y_pos + 5))
-            screen.blit(font.render("Enemies", True, WHITE), (400, 50))
-            for i, (sprite, text) in enumerate(enemy_items):
-                y_pos = 80 + i * 40
-                draw_glow(screen, 400 - 5, y_pos - 5, alien_size, YELLOW)
-                screen.blit(sprite, (400, y_pos))
-                screen.blit(font.render(text, True, WHITE), (435, y_pos + 5))
-            screen.blit(font.render("Select Starting Level (1-20):", True, WHITE), (400, 300))
-            level_text = font.render(str(selected_level), True, WHITE)
-            screen.blit(level_text, (400 + 100 - level_text.get_width() // 2, 330))
-            screen.blit(font.render("Press Space / Cross to Start", True, WHITE), (400 + 50, 360))
-            screen.blit(font.render("Controls", True, WHITE), (550, 50))
-            for i, (key, action) in enumerate(controls):
-                y_pos = 80 + i * 40
-                draw_glow(screen, 550 - 5, y_pos - 5, 20, BLUE)
-                key_text = font.render(key, True, WHITE)
-                action_text = font.render(action, True, WHITE)
-                screen.blit(key_text, (550, y_pos + 5))
-                screen.blit(action_text, (600 + key_text.get_width(), y_pos + 5))
-            pygame.display.flip()
+            assets.poll()
+            if drawn_level != selected_level:
+                screen.blit(layer, (0, 0))
+                level_text = hud.label(str(selected_level))
+                screen.blit(level_text, (400 + 100 - level_text.get_width() // 2, 330))
+                pygame.display.flip()
+                drawn_level = selected_level
 
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
@@ -725,9 +1536,12 @@ def start_screen():
                         joystick = pygame.joystick.Joystick(event.device_index)
                         joystick.init()
                         log(f"Joystick connected: {joystick.get_name()}")
+                elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                    drawn_level = None
+            clock.tick(MENU_FPS)
 
         except Exception as e:
-            log(f"Start screen error: {e}")
+            log(f"Start screen error: {e}", LOG_ERROR)
             return False
 
 def pause_screen():
@@ -740,21 +1554,29 @@ def pause_screen():
         knob_x = slider_x + int(master_volume * 200) - 5
         knob_rect = pygame.Rect(knob_x, slider_y - 5, 10, 20)
         dragging = False
+        layer = None
+        layer_high_score = None
+        drawn_knob_x = None
 
         while True:
-            screen.blit(start_screen_sprite, (0, 0))
-            screen.blit(overlay, (0, 0))
-            screen.blit(title_font.render("Paused", True, WHITE), (WIDTH // 2 - 60, HEIGHT // 2 - 120))
-            screen.blit(font.render("Master Volume", True, WHITE), (WIDTH // 2 - 50, HEIGHT // 2 - 40))
-            screen.blit(font.render(f"High Score: {high_score}", True, WHITE), (WIDTH // 2 - 50, HEIGHT // 2 - 70))
-            pygame.draw.rect(screen, GRAY, slider_rect)
-            pygame.draw.rect(screen, WHITE, knob_rect)
-            screen.blit(font.render("Save High Score", True, WHITE), (WIDTH // 2 - 100, HEIGHT // 2 + 20))
-            screen.blit(font.render("Load High Score", True, WHITE), (WIDTH // 2 + 50, HEIGHT // 2 + 20))
-            screen.blit(font.render("Press P / Options to Resume", True, WHITE), (WIDTH // 2 - 70, HEIGHT // 2 + 60))
-            screen.blit(font.render("Press R / Share to Reset", True, WHITE), (WIDTH // 2 - 60, HEIGHT // 2 + 80))
-            screen.blit(font.render("Press Q / Square to Quit", True, WHITE), (WIDTH // 2 - 50, HEIGHT // 2 + 100))
-            pygame.display.flip()
+            if layer_high_score != high_score:
+                layer = menu_layer(overlay)
+                layer.blit(title_font.render("Paused", True, WHITE), (WIDTH // 2 - 60, HEIGHT // 2 - 120))
+                layer.blit(font.render("Master Volume", True, WHITE), (WIDTH // 2 - 50, HEIGHT // 2 - 40))
+                layer.blit(font.render(f"High Score: {high_score}", True, WHITE), (WIDTH // 2 - 50, HEIGHT // 2 - 70))
+                layer.blit(font.render("Save High Score", True, WHITE), (WIDTH // 2 - 100, HEIGHT // 2 + 20))
+                layer.blit(font.render("Load High Score", True, WHITE), (WIDTH // 2 + 50, HEIGHT // 2 + 20))
+                layer.blit(font.render("Press P / Options to Resume", True, WHITE), (WIDTH // 2 - 70, HEIGHT // 2 + 60))
+                layer.blit(font.render("Press R / Share to Reset", True, WHITE), (WIDTH // 2 - 60, HEIGHT // 2 + 80))
+                layer.blit(font.render("Press Q / Square to Quit", True, WHITE), (WIDTH // 2 - 50, HEIGHT // 2 + 100))
+                layer_high_score = high_score
+                drawn_knob_x = None
+            if drawn_knob_x != knob_rect.x:
+                screen.blit(layer, (0, 0))
+                pygame.draw.rect(screen, GRAY, slider_rect)
+                pygame.draw.rect(screen, WHITE, knob_rect)
+                pygame.display.flip()
+                drawn_knob_x = knob_rect.x
 
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
@@ -787,72 +1609,576 @@ def pause_screen():
                     master_volume = (knob_x - slider_x) / 200
                     update_volumes()
                     knob_rect.x = knob_x - 5
+                elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                    drawn_knob_x = None
+            clock.tick(MENU_FPS)
     except Exception as e:
-        log(f"Pause screen error: {e}")
+        log(f"Pause screen error: {e}", LOG_ERROR)
         return False
 
-def get_boss_difficulty(level, base_level):
-    boss_encounter = (level - base_level) // 5
-    level_factor = max(1, base_level // 5)
-    health = BOSS_HEALTH_BASE * (1 + level_factor) + (boss_encounter * 300)
-    speed = boss_speed_base + (boss_encounter * 0.5)
-    shot_chance = boss_shot_chance_base + (boss_encounter * 0.02)
-    return health, speed, min(shot_chance, 0.1)
+DIFFICULTY_FILE = "difficulty.json"  # Optional; any key below can be overridden without touching the game loop
+DIFFICULTY_DEFAULTS = {
+    "score_per_level": BASE_THRESHOLD,
+    "enemy_shot_chance": enemy_shot_chance,
+    "boss_health_base": BOSS_HEALTH_BASE,
+    "boss_health_per_encounter": 300,
+    "boss_speed_base": boss_speed_base,
+    "boss_speed_per_encounter": 0.5,
+    "boss_shot_chance_base": boss_shot_chance_base,
+    "boss_shot_chance_per_encounter": 0.02,
+    "boss_shot_chance_max": 0.1,
+    # Cumulative roll limits for regular waves and the escorts that join a boss
+    "wave_odds": [["hunter", 0.05], ["hunter_pack", 0.10], ["bug", 0.40], ["bot", 0.70], ["squid", 1.0]],
+    "escort_odds": [["bug", 0.33], ["bot", 0.66], ["squid", 1.0]],
+    "levels": {},  # Per-level overrides, e.g. {"7": {"enemy_shot_chance": 0.02}}
+}
+LEVEL_COUNT = 20
+difficulty_settings = dict(DIFFICULTY_DEFAULTS)
+difficulty_table = {}  # (level, base_level) -> values the game loop reads for that level
+
+def is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def checked_difficulty(overrides, where, per_level=False):
+    # Overrides must have the same shape as the defaults they replace
+    if not isinstance(overrides, dict):
+        raise ValueError(f"{where} should be an object of settings, got {json.dumps(overrides)}")
+    known = set(DIFFICULTY_DEFAULTS) - ({"levels"} if per_level else set())
+    unknown = set(overrides) - known
+    if unknown:
+        log(f"Ignoring unknown difficulty keys in {where}: {sorted(unknown)}", LOG_WARNING)
+    checked = {}
+    for key, value in overrides.items():
+        if key not in known:
+            continue
+        default = DIFFICULTY_DEFAULTS[key]
+        if key == "levels":
+            if not isinstance(value, dict):
+                raise ValueError(f"'levels' should map level numbers to settings, got {json.dumps(value)}")
+            value = {str(lvl): checked_difficulty(settings, f"levels.{lvl}", per_level=True) for lvl, settings in value.items()}
+        elif isinstance(default, list):
+            kinds = set(ENEMY_TYPES) | ({"hunter_pack"} if key == "wave_odds" else set())
+            if not (isinstance(value, list) and value and all(isinstance(odds, list) and len(odds) == 2 and odds[0] in kinds and is_number(odds[1]) for odds in value)):
+                raise ValueError(f"'{key}' in {where} should look like {json.dumps(default)}, got {json.dumps(value)}")
+        elif not is_number(value):
+            raise ValueError(f"'{key}' in {where} should be a number, got {json.dumps(value)}")
+        checked[key] = value
+    return checked
+
+def build_difficulty_table(settings):
+    global difficulty_settings
+    difficulty_settings = settings
+    difficulty_table.clear()
+    for start in range(1, LEVEL_COUNT + 1):
+        for lvl in range(start, LEVEL_COUNT + 1):
+            level_difficulty(lvl, start)
+
+def load_difficulty():
+    try:
+        settings = dict(DIFFICULTY_DEFAULTS)
+        try:
+            with open(resource_path(DIFFICULTY_FILE), "r") as f:
+                overrides = json.load(f)
+        except FileNotFoundError:
+            overrides = None
+        if overrides is not None:
+            settings.update(checked_difficulty(overrides, DIFFICULTY_FILE))
+            log(f"Loaded difficulty overrides from {DIFFICULTY_FILE}")
+        build_difficulty_table(settings)
+    except Exception as e:
+        log(f"Difficulty file ignored, using the defaults: {e}", LOG_WARNING)
+        build_difficulty_table(dict(DIFFICULTY_DEFAULTS))
+    log(f"Built difficulty table for {len(difficulty_table)} level/start combinations")
+
+def level_difficulty(level, base_level):
+    entry = difficulty_table.get((level, base_level))
+    if entry is None:  # Only levels past LEVEL_COUNT get here after load_difficulty
+        settings = dict(difficulty_settings)
+        settings.update(difficulty_settings["levels"].get(str(level), {}))
+        boss_encounter = (level - base_level) // 5
+        level_factor = max(1, base_level // 5)
+        entry = {
+            "score_threshold": (level - base_level + 1) * settings["score_per_level"],
+            "enemy_shot_chance": settings["enemy_shot_chance"],
+            "boss_health": settings["boss_health_base"] * (1 + level_factor) + boss_encounter * settings["boss_health_per_encounter"],
+            "boss_speed": settings["boss_speed_base"] + boss_encounter * settings["boss_speed_per_encounter"],
+            "boss_shot_chance": min(settings["boss_shot_chance_base"] + boss_encounter * settings["boss_shot_chance_per_encounter"],
+                                    settings["boss_shot_chance_max"]),
+            "wave_odds": settings["wave_odds"],
+            "escort_odds": settings["escort_odds"],
+        }
+        difficulty_table[(level, base_level)] = entry
+    return entry
+
+def roll_spawn(odds):
+    roll = random.random()
+    for kind, limit in odds:
+        if roll < limit:
+            return kind
+    return odds[-1][0]
+
+class Alien:
+    __slots__ = ("kind", "x", "y", "prev_x", "prev_y", "frames", "frame", "frame_timer", "dead")
+    size = alien_size
+    homing = False  # Steers toward the player instead of falling straight down
+
+    def __init__(self, kind, x, y, frames):
+        self.kind = kind
+        self.x = self.prev_x = x
+        self.y = self.prev_y = y
+        self.frames = frames
+        self.frame = 0
+        self.frame_timer = 0
+        self.dead = False
+
+class Hunter(Alien):
+    __slots__ = ()
+    homing = True
+
+class Boss(Alien):
+    __slots__ = ("health",)
+    size = boss_size
+    homing = True
+
+    def __init__(self, x, y, frames, health):
+        super().__init__("boss", x, y, frames)
+        self.health = health
+
+PLAYER_SHOT = 0
+BUDDY_SHOT = 1
+ENEMY_SHOT = 2
+ENEMY_SHOT_DAMAGE = 35
+
+class ProjectileStore:
+    # Every live shot is a row in a set of preallocated arrays; rows are only
+    # marked dead during a frame and packed together once by compact().
+    COLUMNS = ("x", "y", "dx", "dy", "lifetime", "damage", "owner", "piercing", "dead")
+
+    def __init__(self, capacity=2048):
+        self.count = 0
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.dx = np.zeros(capacity, dtype=np.float32)
+        self.dy = np.zeros(capacity, dtype=np.float32)
+        self.lifetime = np.zeros(capacity, dtype=np.int16)  # -1 never expires
+        self.damage = np.zeros(capacity, dtype=np.int16)
+        self.owner = np.zeros(capacity, dtype=np.int8)
+        self.piercing = np.zeros(capacity, dtype=bool)
+        self.dead = np.zeros(capacity, dtype=bool)
+
+    def reserve(self, extra):
+        needed = self.count + extra
+        capacity = len(self.x)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:self.count] = column[:self.count]
+            setattr(self, name, grown)
+
+    def add(self, owner, x, y, dx, dy, lifetime=-1, piercing=False, damage=0):
+        self.reserve(1)
+        i = self.count
+        self.x[i] = x
+        self.y[i] = y
+        self.dx[i] = dx
+        self.dy[i] = dy
+        self.lifetime[i] = lifetime
+        self.damage[i] = damage
+        self.owner[i] = owner
+        self.piercing[i] = piercing
+        self.dead[i] = False
+        self.count = i + 1
+
+    def add_many(self, owner, x, y, dx, dy, lifetime=-1, piercing=False, damage=0):
+        dx = np.asarray(dx, dtype=np.float32)
+        dy = np.asarray(dy, dtype=np.float32)
+        k = max(dx.size, dy.size)
+        self.reserve(k)
+        rows = slice(self.count, self.count + k)
+        self.x[rows] = x
+        self.y[rows] = y
+        self.dx[rows] = dx
+        self.dy[rows] = dy
+        self.lifetime[rows] = lifetime
+        self.damage[rows] = damage
+        self.owner[rows] = owner
+        self.piercing[rows] = piercing
+        self.dead[rows] = False
+        self.count += k
+
+    def step(self):
+        n = self.count
+        if not n:
+            return
+        x, y, lifetime = self.x[:n], self.y[:n], self.lifetime[:n]
+        x += self.dx[:n]
+        y += self.dy[:n]
+        np.subtract(lifetime, 1, out=lifetime, where=lifetime > 0)
+        gone = (y > HEIGHT) | (x < 0) | (x > WIDTH) | (lifetime == 0)
+        gone |= (y < -shot_length) & (self.owner[:n] != ENEMY_SHOT)  # Enemy volleys leave the top only by expiring
+        self.dead[:n] |= gone
+
+    def select(self, owner, *fields, box=None):
+        n = self.count
+        mask = (self.owner[:n] == owner) & ~self.dead[:n]
+        if box:
+            left, top, right, bottom = box
+            x, y = self.x[:n], self.y[:n]
+            mask &= (x > left) & (x < right) & (y > top) & (y < bottom)
+        rows = np.flatnonzero(mask)
+        return [rows.tolist()] + [getattr(self, name)[rows].tolist() for name in fields]
+
+    def kill(self, i):
+        self.dead[i] = True
+
+    def clear(self, owner=None):
+        n = self.count
+        if owner is None:
+            self.dead[:n] = True
+        else:
+            self.dead[:n] |= self.owner[:n] == owner
+
+    def compact(self):
+        n = self.count
+        keep = ~self.dead[:n]
+        alive = int(np.count_nonzero(keep))
+        if alive < n:
+            for name in self.COLUMNS:
+                column = getattr(self, name)
+                column[:alive] = column[:n][keep]
+        self.count = alive
+
+    def live(self, owner):
+        n = self.count
+        return int(np.count_nonzero((self.owner[:n] == owner) & ~self.dead[:n]))
+
+COLLISION_CELL_SIZE = 64
+
+class SpatialHash:
+    # Uniform grid broadphase. Items come back from query() in insertion order,
+    # so "first alien in the list wins" hit rules are unchanged.
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = collections.defaultdict(list)
+        self.items = []
+
+    def clear(self):
+        self.cells.clear()
+        self.items.clear()
+
+    def cell_range(self, x, y, w, h):
+        size = self.cell_size
+        return range(int(x // size), int((x + w) // size) + 1), range(int(y // size), int((y + h) // size) + 1)
+
+    def insert(self, item, x, y, w, h):
+        seq = len(self.items)
+        self.items.append(item)
+        cols, rows = self.cell_range(x, y, w, h)
+        for cx in cols:
+            for cy in rows:
+                self.cells[(cx, cy)].append(seq)
+
+    def query(self, x, y, w, h):
+        cols, rows = self.cell_range(x, y, w, h)
+        items, cells = self.items, self.cells
+        if len(cols) == 1 and len(rows) == 1:
+            return [items[seq] for seq in cells.get((cols[0], rows[0]), ())]
+        found = set()
+        for cx in cols:
+            for cy in rows:
+                found.update(cells.get((cx, cy), ()))
+        return [items[seq] for seq in sorted(found)]
+
+collision_grid = SpatialHash(COLLISION_CELL_SIZE)
+
+def nearest_alien(x, y):
+    # Auto-aim target; argmin keeps the first alien on ties, like min() over the list
+    live = [alien for alien in aliens if not alien.dead]
+    if not live:
+        return None
+    xs = np.fromiter([alien.x for alien in live], np.float64, len(live))
+    ys = np.fromiter([alien.y for alien in live], np.float64, len(live))
+    return live[int(np.argmin((xs - x) ** 2 + (ys - y) ** 2))]
+
+class PowerUp:
+    __slots__ = ("kind", "x", "y", "prev_x", "prev_y", "dead")
+    size = power_up_size
+
+    def __init__(self, kind, x, y):
+        self.kind = kind  # Key into POWER_UP_FILES / power_up_sprites
+        self.x = self.prev_x = x
+        self.y = self.prev_y = y
+        self.dead = False
+
+class Meteor:
+    __slots__ = ("x", "y", "speed", "dead")
+    kind = "meteor"
+    size = 20
+
+    def __init__(self, x, y, speed):
+        self.x = x
+        self.y = y
+        self.speed = speed
+        self.dead = False
+
+def compact_entities(entities):
+    # Entities are only flagged dead mid-frame; drop them all in one pass, in place
+    entities[:] = [entity for entity in entities if not entity.dead]
+
+ENEMY_TYPES = {"bug": Alien, "bot": Alien, "squid": Alien, "hunter": Hunter}
+BOSS_SHOT_DAMAGE = 25
+
+def enemy_frames(kind):
+    return {"bug": bug_frames, "bot": bot_frames, "squid": squid_frames, "hunter": hunter_frames}[kind]
+
+def spawn_enemy(kind, x):
+    alien = ENEMY_TYPES[kind](kind, x, 0, enemy_frames(kind))
+    aliens.append(alien)
+    return alien
+
+def find_boss():
+    for alien in aliens:
+        if alien.kind == "boss":
+            return alien
+    return None
 
 def spawn_alien():
-    if level % 5 == 0 and boss_types and not any(len(a) == 7 for a in aliens):
+    if level % 5 == 0 and boss_types and not find_boss():
         x = random.randint(0, WIDTH - boss_size)
         frames = boss_types[(level // 5 - 1) % len(boss_types)]
-        boss_health, boss_speed, boss_shot_chance = get_boss_difficulty(level, base_level)
-        aliens.append([x, 0, frames, True, boss_health, 0, 0])
-        for i in range(6):
-            angle = math.radians(i * 60)
-            enemy_shots.append([x + boss_size//2, boss_size//2, 
-                              enemy_shot_speed * math.cos(angle), 
-                              enemy_shot_speed * math.sin(angle), 120])
+        difficulty = level_difficulty(level, base_level)
+        boss_health = difficulty["boss_health"]
+        aliens.append(Boss(x, 0, frames, boss_health))
+        flight_recorder.record("spawn", kind="boss", x=x, health=boss_health, level=level)
+        angles = np.radians(np.arange(6) * 60)
+        projectiles.add_many(ENEMY_SHOT, x + boss_size//2, boss_size//2, 
+                             enemy_shot_speed * np.cos(angles), enemy_shot_speed * np.sin(angles), 
+                             ENEMY_SHOT_LIFETIME, damage=BOSS_SHOT_DAMAGE)
         for _ in range(3):
             x = random.randint(0, WIDTH - alien_size)
-            roll = random.random()
-            if roll < 0.33:
-                aliens.append([x, 0, bug_frames, False, 0, 0])
-            elif roll < 0.66:
-                aliens.append([x, 0, bot_frames, False, 0, 0])
-            else:
-                aliens.append([x, 0, squid_frames, False, 0, 0])
+            spawn_enemy(roll_spawn(difficulty["escort_odds"]), x)
     elif not (level % 5 == 0):
         x = random.randint(0, WIDTH - alien_size)
-        roll = random.random()
-        if roll < 0.05:
-            aliens.append([x, 0, hunter_frames, True, 0, 0])
-        elif roll < 0.10:  # 5% chance to spawn a pack of hunters
+        kind = roll_spawn(level_difficulty(level, base_level)["wave_odds"])
+        if kind == "hunter_pack":
             for _ in range(3):  # Spawn 3 hunters in a pack
                 pack_x = random.randint(0, WIDTH - alien_size)
-                aliens.append([pack_x, 0, hunter_frames, True, 0, 0])
-        elif roll < 0.40:
-            aliens.append([x, 0, bug_frames, False, 0, 0])
-        elif roll < 0.70:
-            aliens.append([x, 0, bot_frames, False, 0, 0])
+                spawn_enemy("hunter", pack_x)
         else:
-            aliens.append([x, 0, squid_frames, False, 0, 0])
+            spawn_enemy(kind, x)
+        flight_recorder.record("spawn", kind=aliens[-1].kind, x=aliens[-1].x, aliens=len(aliens))
+
+class PowerUpType:
+    __slots__ = ("name", "weight", "duration", "apply", "expire")
+
+    def __init__(self, name, weight, apply, expire=None, duration=0):
+        self.name = name  # Key into POWER_UP_FILES / power_up_sprites
+        self.weight = weight  # Relative spawn weight
+        self.duration = duration  # Simulation steps the effect lasts; 0 for instant effects
+        self.apply = apply
+        self.expire = expire
+
+class EffectScheduler:
+    # Min-heap of (expiry step, power-up). Picking up an active effect again only moves its deadline;
+    # the stale heap entry is skipped when it surfaces, so nothing is polled per step.
+    def __init__(self):
+        self.heap = []
+        self.deadlines = {}
+
+    def clear(self):
+        self.heap.clear()
+        self.deadlines.clear()
+
+    def start(self, name, now, duration):
+        deadline = now + duration - 1  # Same last active step as the old per-frame countdowns
+        self.deadlines[name] = deadline
+        heapq.heappush(self.heap, (deadline, name))
+
+    def run_due(self, now):
+        heap = self.heap
+        while heap and heap[0][0] <= now:
+            deadline, name = heapq.heappop(heap)
+            if self.deadlines.get(name) == deadline:
+                del self.deadlines[name]
+                power_up_types[name].expire()
+
+def apply_rate():
+    global shot_cooldown
+    shot_cooldown = max(10, shot_cooldown - 5)
+
+def apply_reinforce():
+    global player_health
+    player_health = min(PLAYER_MAX_HEALTH, player_health + 100)
+
+def apply_diver_pod():
+    global divers_rescued
+    divers_rescued += 1
+
+def apply_mg94():
+    global shot_cooldown
+    shot_cooldown = 5
+
+def apply_hellbomb():
+    global score, level, player_size, player_frames, player_x, player_dx, player_dy, player_angle, dual_blasts, level_up_text, spawn_interval
+    flight_recorder.record("kill", kind="hellbomb", by="player", count=len(aliens))
+    score += len(aliens) * 50 * (2 if eagle_sweat_active else 1)
+    aliens.clear()
+    projectiles.clear(ENEMY_SHOT)
+    projectiles.clear(BUDDY_SHOT)
+    power_ups.clear()
+    if boom_sound: boom_sound.play()
+    if level % 5 == 0:
+        level += 1
+        flight_recorder.record("level", level=level, score=score, reason="hellbomb")
+        if level >= 10 and not dual_blasts:
+            player_size = large_player_size
+            player_frames = assets.get("player_large")
+            player_x = WIDTH // 2 - player_size // 2
+            player_dx = 0
+            player_dy = 0
+            player_angle = 90
+            dual_blasts = True
+        aliens.clear()
+        projectiles.clear()
+        power_ups.clear()
+        generate_background(level)
+        if level_up_sound: level_up_sound.play()
+        if level % 5 == 0 and boss_types:
+            spawn_alien()
+        level_up_text = [title_font.render(f"Level {level}", True, WHITE), WIDTH // 2, HEIGHT // 2, 255, level_up_duration]
+        spawn_interval = 15
+
+def apply_double_shot():
+    global double_shot
+    double_shot = True
+
+def expire_double_shot():
+    global double_shot
+    double_shot = False
+
+def apply_piercing_shot():
+    global piercing_shot
+    piercing_shot = True
+
+def expire_piercing_shot():
+    global piercing_shot
+    piercing_shot = False
+
+def apply_shield():
+    global shield_active
+    shield_active = True
+
+def expire_shield():
+    global shield_active
+    shield_active = False
+
+def apply_trishot():
+    global trishot
+    trishot = True
+
+def expire_trishot():
+    global trishot
+    trishot = False
+
+def apply_quad_shot():
+    global quad_shot
+    quad_shot = True
+
+def expire_quad_shot():
+    global quad_shot
+    quad_shot = False
+
+def apply_burst():
+    global burst_mode
+    burst_mode = True
+
+def expire_burst():
+    global burst_mode
+    burst_mode = False
+
+def apply_eagle_sweat():
+    global eagle_sweat_active
+    eagle_sweat_active = True
+    if eagle_sweat_sound: eagle_sweat_sound.play()
+
+def expire_eagle_sweat():
+    global eagle_sweat_active
+    eagle_sweat_active = False
+
+def apply_battle_buddy():
+    global battle_buddy_active, battle_buddy_shot_timer
+    battle_buddy_active = True
+    battle_buddy_shot_timer = battle_buddy_shot_cooldown
+    if battle_buddy_sound: battle_buddy_sound.play()
+
+def expire_battle_buddy():
+    global battle_buddy_active
+    battle_buddy_active = False
+    projectiles.clear(BUDDY_SHOT)
+
+power_up_types = {}
+power_up_alias = ([], [], [])  # Names, keep probabilities and alias indices for O(1) weighted picks
+power_up_timers = EffectScheduler()
+
+def build_power_up_alias():
+    # Vose's alias method: every slot keeps its own name with probability keep[i], otherwise hands over to alias[i]
+    names = [name for name, power_up in power_up_types.items() if power_up.weight > 0]
+    total = sum(power_up_types[name].weight for name in names)
+    count = len(names)
+    weights = [power_up_types[name].weight * count / total for name in names]
+    keep, alias = [1.0] * count, list(range(count))
+    small = [i for i, p in enumerate(weights) if p < 1]
+    large = [i for i, p in enumerate(weights) if p >= 1]
+    while small and large:
+        low, high = small.pop(), large.pop()
+        keep[low], alias[low] = weights[low], high
+        weights[high] -= 1 - weights[low]
+        (small if weights[high] < 1 else large).append(high)
+    names_slot, keep_slot, alias_slot = power_up_alias
+    names_slot[:], keep_slot[:], alias_slot[:] = names, keep, alias
+
+def register_power_up(power_up):
+    power_up_types[power_up.name] = power_up
+    build_power_up_alias()
+
+for power_up in (
+    PowerUpType("rate", 15, apply_rate),
+    PowerUpType("reinforce", 15, apply_reinforce),
+    PowerUpType("diver_pod", 10, apply_diver_pod),
+    PowerUpType("resupply", 15, apply_double_shot, expire_double_shot, duration=300),
+    PowerUpType("hellbomb", 2, apply_hellbomb),
+    PowerUpType("mg94", 5, apply_mg94),
+    PowerUpType("eat17", 10, apply_piercing_shot, expire_piercing_shot, duration=300),
+    PowerUpType("shield", 10, apply_shield, expire_shield, duration=300),
+    PowerUpType("trishot", 5, apply_trishot, expire_trishot, duration=300),
+    PowerUpType("quad", 5, apply_quad_shot, expire_quad_shot, duration=300),
+    PowerUpType("burst", 5, apply_burst, expire_burst, duration=300),
+    PowerUpType("eagle_sweat", 2, apply_eagle_sweat, duration=600, expire=expire_eagle_sweat),
+    PowerUpType("battle_buddy", 1, apply_battle_buddy, duration=1800, expire=expire_battle_buddy),
+):
+    register_power_up(power_up)
+
+def roll_power_up():
+    names, keep, alias = power_up_alias
+    pick = random.random() * len(names)
+    slot = int(pick)
+    return names[slot] if pick - slot < keep[slot] else names[alias[slot]]
+
+def activate_power_up(name):
+    power_up = power_up_types[name]
+    power_up.apply()
+    if power_up.duration:
+        power_up_timers.start(name, frame_count, power_up.duration)
 
 def spawn_power_up(x, y):
     try:
-        roll = random.random()
-        if roll < 0.15: power_ups.append([x, y, power_up_sprites["rate"]])
-        elif roll < 0.30: power_ups.append([x, y, power_up_sprites["reinforce"]])
-        elif roll < 0.40: power_ups.append([x, y, power_up_sprites["diver_pod"]])
-        elif roll < 0.55: power_ups.append([x, y, power_up_sprites["resupply"]])
-        elif roll < 0.57: power_ups.append([x, y, power_up_sprites["hellbomb"]])  # Reduced to 2% (from 10%)
-        elif roll < 0.62: power_ups.append([x, y, power_up_sprites["mg94"]])
-        elif roll < 0.72: power_ups.append([x, y, power_up_sprites["eat17"]])
-        elif roll < 0.82: power_ups.append([x, y, power_up_sprites["shield"]])
-        elif roll < 0.87: power_ups.append([x, y, power_up_sprites["trishot"]])
-        elif roll < 0.92: power_ups.append([x, y, power_up_sprites["quad"]])
-        elif roll < 0.97: power_ups.append([x, y, power_up_sprites["burst"]])
-        elif roll < 0.99: power_ups.append([x, y, power_up_sprites["eagle_sweat"]])
-        elif roll < 1.0: power_ups.append([x, y, power_up_sprites["battle_buddy"]])
+        power_ups.append(PowerUp(roll_power_up(), x, y))
     except Exception as e:
-        log(f"Power-up spawn failed: {e}")
+        log(f"Power-up spawn failed: {e}", LOG_ERROR)
 
 def game_over_screen(final_score, kill_streak, highest_kill_streak, capture_streak, highest_capture_streak):
     global high_score, joystick
@@ -890,33 +2216,33 @@ def game_over_screen(final_score, kill_streak, highest_kill_streak, capture_stre
             share_button_rect.height + 2 * share_button_padding
         )
 
-        while True:
-            screen.blit(start_screen_sprite, (0, 0))
-            screen.blit(overlay, (0, 0))
-            current_y = start_y
-            for i, (text, fnt) in enumerate(text_elements):
-                rendered = fnt.render(text, True, WHITE)
-                if i == 0:
-                    screen.blit(rendered, (WIDTH // 2 - rendered.get_width() // 2, current_y))
-                    current_y += fnt.get_height() + line_spacing
-                elif i == 10:  # "Coded by Grok" gets extra spacing before credits
-                    screen.blit(rendered, (WIDTH // 2 - rendered.get_width() // 2, current_y))
-                    current_y += line_spacing * 2
-                else:
-                    screen.blit(rendered, (WIDTH // 2 - rendered.get_width() // 2, current_y))
-                    current_y += line_spacing
-                if i == 9:  # After "Press Q / Square to Quit"
-                    share_button_rect.centery = current_y + line_spacing + share_button_rect.height // 2
-                    share_button_bg.top = share_button_rect.top - share_button_padding
-                    current_y += share_button_bg.height + line_spacing
-
-            mouse_pos = pygame.mouse.get_pos()
-            if share_button_bg.collidepoint(mouse_pos):
-                pygame.draw.rect(screen, NEON_GREEN, share_button_bg, border_radius=5)
+        layer = menu_layer(overlay)
+        current_y = start_y
+        for i, (text, fnt) in enumerate(text_elements):
+            rendered = fnt.render(text, True, WHITE)
+            if i == 0:
+                layer.blit(rendered, (WIDTH // 2 - rendered.get_width() // 2, current_y))
+                current_y += fnt.get_height() + line_spacing
+            elif i == 10:  # "Coded by Grok" gets extra spacing before credits
+                layer.blit(rendered, (WIDTH // 2 - rendered.get_width() // 2, current_y))
+                current_y += line_spacing * 2
             else:
-                pygame.draw.rect(screen, GRAY, share_button_bg, border_radius=5)
-            screen.blit(share_button_text, share_button_rect)
-            pygame.display.flip()
+                layer.blit(rendered, (WIDTH // 2 - rendered.get_width() // 2, current_y))
+                current_y += line_spacing
+            if i == 9:  # After "Press Q / Square to Quit"
+                share_button_rect.centery = current_y + line_spacing + share_button_rect.height // 2
+                share_button_bg.top = share_button_rect.top - share_button_padding
+                current_y += share_button_bg.height + line_spacing
+        drawn_hover = None
+
+        while True:
+            hover = share_button_bg.collidepoint(pygame.mouse.get_pos())
+            if drawn_hover != hover:
+                screen.blit(layer, (0, 0))
+                pygame.draw.rect(screen, NEON_GREEN if hover else GRAY, share_button_bg, border_radius=5)
+                screen.blit(share_button_text, share_button_rect)
+                pygame.display.flip()
+                drawn_hover = hover
 
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
@@ -939,20 +2265,528 @@ def game_over_screen(final_score, kill_streak, highest_kill_streak, capture_stre
                             webbrowser.open(x_url)
                             log(f"Opened browser to share score on X.com: {x_url}")
                         except Exception as e:
-                            log(f"Failed to open X.com share URL: {e}")
+                            log(f"Failed to open X.com share URL: {e}", LOG_WARNING)
+                elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                    drawn_hover = None
 
-            clock.tick(60)
+            clock.tick(MENU_FPS)
     except Exception as e:
-        log(f"Game over screen error: {e}")
+        log(f"Game over screen error: {e}", LOG_ERROR)
         return False
 
-def run_game():
-    global player_x, player_y, player_dx, player_dy, player_angle, score, aliens, shots, enemy_shots, power_ups, spawn_timer, shot_timer, shot_cooldown, divers_rescued, double_shot, double_shot_timer, piercing_shot, piercing_shot_timer, trishot, trishot_timer, quad_shot, quad_shot_timer, burst_mode, burst_timer, shield_active, shield_timer, eagle_sweat_active, eagle_sweat_timer, battle_buddy_active, battle_buddy_timer, battle_buddy_x, battle_buddy_y, battle_buddy_shot_timer, battle_buddy_shots, paused, level, stars, planet_surface, player_frame, player_frame_timer, level_up_text, player_size, player_frames, dual_blasts, base_level, player_health, first_level_1_start, joystick
-   
-    if pygame.joystick.get_count() > 0 and not joystick:
-        joystick = pygame.joystick.Joystick(0)
-        joystick.init()
+def update_game():
+    # One fixed SIM_DT step; every speed, cooldown and timer below is tuned per step
+    global player_x, player_y, player_dx, player_dy, player_angle, score, spawn_timer, shot_timer, shot_cooldown, divers_rescued, battle_buddy_x, battle_buddy_y, battle_buddy_shot_timer, level, player_frame, player_frame_timer, level_up_text, player_size, player_frames, dual_blasts, player_health, kill_streak, highest_kill_streak, capture_streak, highest_capture_streak, break_free_used, spawn_interval, frame_count, prev_player_x, prev_player_y
+
+    frame_count += 1
+    prev_player_x, prev_player_y = player_x, player_y
+    for entity in aliens + power_ups:
+        entity.prev_x, entity.prev_y = entity.x, entity.y
+
+    boss_level = level % 5 == 0
+    if not boss_level and score >= level_difficulty(level, base_level)["score_threshold"]:
+        level += 1
+        flight_recorder.record("level", level=level, score=score, reason="threshold")
+        if level >= 10 and not dual_blasts:
+            player_size = large_player_size
+            player_frames = assets.get("player_large")
+            player_x = WIDTH // 2 - player_size // 2
+            player_dx = 0
+            player_dy = 0
+            player_angle = 90
+            dual_blasts = True
+        aliens.clear()
+        projectiles.clear()
+        power_ups.clear()
+        generate_background(level)  # Single reset on level-up
+        if level_up_sound: level_up_sound.play()
+        if level % 5 == 0 and boss_types:
+            spawn_alien()
+        level_up_text = [title_font.render(f"Level {level}", True, WHITE), WIDTH // 2, HEIGHT // 2, 255, level_up_duration]
+        spawn_interval = 15
+
+    spawn_timer += 1
+    if spawn_timer >= spawn_interval:
+        if not boss_level:
+            spawn_alien()
+        elif boss_level and find_boss():
+            if random.random() < 0.1:
+                x = random.randint(0, WIDTH - alien_size)
+                spawn_enemy(roll_spawn(level_difficulty(level, base_level)["escort_odds"]), x)
+        spawn_timer = 0
+
+    if joystick:
+        x_axis = joystick.get_axis(0)
+        y_axis = joystick.get_axis(1)
+        if abs(x_axis) > 0.1:
+            player_dx += x_axis * 0.5
+            player_dx = max(-player_speed, min(player_speed, player_dx))
+        if abs(y_axis) > 0.1:
+            player_dy += y_axis * 0.5
+            player_dy = max(-player_speed, min(player_speed, player_dy))
+
+        rot_axis = joystick.get_axis(2)
+        if abs(rot_axis) > 0.1:
+            player_angle += rot_axis * 2
+
+        player_x += player_dx
+        player_y += player_dy
+        player_dx *= 0.95
+        player_dy *= 0.95
+        player_x = max(0, min(WIDTH - player_size, player_x))
+        player_y = max(0, min(HEIGHT - player_size, player_y))
+
+        r2_value = (joystick.get_axis(5) + 1) / 2
+        fire_active = r2_value > 0.5
+    else:
+        keys = scripted_keys if scripted_keys is not None else pygame.key.get_pressed()
+        if input_recorder: input_recorder.sample(frame_count, keys)
+        if keys[pygame.K_LEFT]:
+            player_dx -= 0.5
+            player_dx = max(-player_speed, min(player_speed, player_dx))
+        if keys[pygame.K_RIGHT]:
+            player_dx += 0.5
+            player_dx = max(-player_speed, min(player_speed, player_dx))
+        if keys[pygame.K_UP]:
+            player_dy -= 0.5
+            player_dy = max(-player_speed, min(player_speed, player_dy))
+        if keys[pygame.K_DOWN]:
+            player_dy += 0.5
+            player_dy = max(-player_speed, min(player_speed, player_dy))
+
+        player_x += player_dx
+        player_y += player_dy
+        player_dx *= 0.95
+        player_dy *= 0.95
+        player_x = max(0, min(WIDTH - player_size, player_x))
+        player_y = max(0, min(HEIGHT - player_size, player_y))
+
+        fire_active = keys[pygame.K_SPACE]
+
+    if fire_active and shot_timer <= 0:
+        angle_rad = math.radians(player_angle)
+        shot_dx = math.cos(angle_rad) * shot_speed
+        shot_dy = math.sin(angle_rad) * shot_speed
+        shot_x = player_x + player_size // 2 - math.cos(angle_rad) * (player_size // 2)
+        shot_y = player_y + player_size // 2 - math.sin(angle_rad) * (player_size // 2)
+        if burst_mode:
+            projectiles.add(PLAYER_SHOT, shot_x, shot_y, shot_dx, shot_dy, piercing=piercing_shot)
+            shot_timer = 1
+        else:
+            if quad_shot:
+                offsets = (-15, -5, 5, 15)
+            elif trishot:
+                offsets = (-10, 0, 10)
+            elif double_shot or dual_blasts:
+                offsets = (-5, 5)
+            else:
+                offsets = (0,)
+            offset_rad = np.radians(player_angle + np.array(offsets))
+            projectiles.add_many(PLAYER_SHOT, shot_x, shot_y, np.cos(offset_rad) * shot_speed, np.sin(offset_rad) * shot_speed, piercing=piercing_shot)
+            shot_timer = shot_cooldown
+        if shoot_sound: shoot_sound.play()
+
+    player_frame_timer += 1
+    if player_frame_timer >= player_frame_speed:
+        player_frame_timer = 0
+        player_frame = (player_frame + 1) % len(player_frames)
+
+    if battle_buddy_active:
+        battle_buddy_x = player_x + player_size + 10
+        battle_buddy_y = player_y - battle_buddy_size
+
+        battle_buddy_shot_timer -= 1
+        if battle_buddy_shot_timer <= 0 and aliens:
+            target = nearest_alien(battle_buddy_x, battle_buddy_y)
+            if target:
+                dx = target.x - battle_buddy_x
+                dy = target.y - battle_buddy_y
+                dist = max(1, math.hypot(dx, dy))
+                projectiles.add(BUDDY_SHOT, battle_buddy_x + battle_buddy_size // 2, battle_buddy_y, shot_speed * dx / dist, shot_speed * dy / dist)
+                if shoot_sound: shoot_sound.play()
+            battle_buddy_shot_timer = battle_buddy_shot_cooldown
+
+
+    difficulty = level_difficulty(level, base_level)
+    for alien in aliens:
+        is_boss = alien.kind == "boss"
+        x, y = alien.x, alien.y
+        size = alien.size
+        speed = alien_speed
+        shot_chance = difficulty["enemy_shot_chance"]
+        if is_boss:
+            speed, shot_chance = difficulty["boss_speed"], difficulty["boss_shot_chance"]
+        elif alien.homing:
+            speed = hunter_speed
+
+        if alien.homing:
+            dx = player_x + player_size // 2 - x
+            dy = player_y + player_size // 2 - y
+            dist = max(1, math.hypot(dx, dy))
+            alien.x += speed * dx / dist
+            alien.y += speed * dy / dist
+            if hunter_thrust_sound and random.random() < 0.05 and not is_boss: hunter_thrust_sound.play()
+        else:
+            alien.y += speed
+
+        if alien.y > HEIGHT:
+            alien.dead = True
+
+        if random.random() < shot_chance and frame_count > 60:
+            if is_boss:
+                center_x, center_y = x + size // 2, y + size // 2
+                angles = np.radians(np.arange(6) * 60 + frame_count % 360)
+                speed_variation = enemy_shot_speed * (1 + np.array([random.uniform(0, 0.5) for _ in range(6)]))
+                projectiles.add_many(ENEMY_SHOT, center_x, center_y, speed_variation * np.cos(angles), speed_variation * np.sin(angles), 
+                                     ENEMY_SHOT_LIFETIME, damage=BOSS_SHOT_DAMAGE)
+            elif not alien.homing:
+                projectiles.add(ENEMY_SHOT, x + size // 2, y + size, 0, enemy_shot_speed, ENEMY_SHOT_LIFETIME, damage=ENEMY_SHOT_DAMAGE)
+
+        alien.frame_timer += 1
+        if alien.frame_timer >= (boss_frame_speed if is_boss else alien_frame_speed):
+            alien.frame_timer = 0
+            alien.frame = (alien.frame + 1) % len(alien.frames)
+
+    projectiles.step()
+
+    for pu in power_ups:
+        pu_x, pu_y = pu.x, pu.y
+        if piercing_shot:
+            dx = player_x + player_size // 2 - pu_x
+            dy = player_y + player_size // 2 - pu_y
+            dist = max(1, math.hypot(dx, dy))
+            pu.x += 3 * dx / dist
+            pu.y += 3 * dy / dist
+        else:
+            pu.y += 3
+        if pu.y > HEIGHT:
+            pu.dead = True
+            capture_streak = 0
+
+    collision_grid.clear()
+    for alien in aliens:
+        collision_grid.insert(alien, alien.x - 5, alien.y, alien.size + 10, alien.size)
+
+    for shot, shot_x, shot_y, piercing in zip(*projectiles.select(PLAYER_SHOT, "x", "y", "piercing")):
+        if projectiles.dead[shot]:
+            continue
+        for alien in collision_grid.query(shot_x, shot_y, 0, shot_length):
+            if alien.dead:
+                continue
+            is_boss = alien.kind == "boss"
+            x, y = alien.x, alien.y
+            size = alien.size
+            if y < shot_y + shot_length and y + size > shot_y and x - 5 < shot_x < x + size + 5:
+                if is_boss:
+                    alien.health -= 5
+                    if alien.health <= 0:
+                        alien.dead = True
+                        score += 500 * (2 if eagle_sweat_active else 1)
+                        flight_recorder.record("kill", kind="boss", by="player", x=x, y=y, score=score)
+                        kill_streak += 1
+                        highest_kill_streak = max(highest_kill_streak, kill_streak)
+                        if kill_streak == 5:
+                            player_health = min(PLAYER_MAX_HEALTH, player_health + 50)
+                        elif kill_streak == 10:
+                            shot_cooldown = max(5, shot_cooldown - 2)
+                        elif kill_streak == 15:
+                            score += 1000
+                            spawn_power_up(player_x, player_y)
+                        spawn_power_up(x, y)
+                        if boss_level:
+                            level += 1
+                            flight_recorder.record("level", level=level, score=score, reason="boss_kill")
+                            if level >= 10 and not dual_blasts:
+                                player_size = large_player_size
+                                player_frames = assets.get("player_large")
+                                player_x = WIDTH // 2 - player_size // 2
+                                player_dx = 0
+                                player_dy = 0
+                                player_angle = 90
+                                dual_blasts = True
+                            aliens.clear()
+                            projectiles.clear()
+                            power_ups.clear()
+                            generate_background(level)
+                            if level_up_sound: level_up_sound.play()
+                            if level % 5 == 0 and boss_types:
+                                spawn_alien()
+                            level_up_text = [title_font.render(f"Level {level}", True, WHITE), WIDTH // 2, HEIGHT // 2, 255, level_up_duration]
+                            spawn_interval = 15
+                else:
+                    alien.dead = True
+                    score += 10 * (2 if eagle_sweat_active else 1)
+                    flight_recorder.record("kill", kind=alien.kind, by="player", x=x, y=y, score=score)
+                    kill_streak += 1
+                    highest_kill_streak = max(highest_kill_streak, kill_streak)
+                    if kill_streak == 5:
+                        player_health = min(PLAYER_MAX_HEALTH, player_health + 50)
+                    elif kill_streak == 10:
+                        shot_cooldown = max(5, shot_cooldown - 2)
+                    elif kill_streak == 15:
+                        score += 1000
+                        spawn_power_up(player_x, player_y)
+                    spawn_power_up(x, y)
+                if hit_sound: hit_sound.play()
+                if piercing and random.random() < 0.5:
+                    projectiles.add_many(PLAYER_SHOT, shot_x, shot_y, (-5, 5), shot_speed)
+                if not piercing:
+                    projectiles.kill(shot)
+                break
+
+    for b_shot, shot_x, shot_y in zip(*projectiles.select(BUDDY_SHOT, "x", "y")):
+        if projectiles.dead[b_shot]:
+            continue
+        for alien in collision_grid.query(shot_x, shot_y, 0, shot_length):
+            if alien.dead:
+                continue
+            is_boss = alien.kind == "boss"
+            x, y = alien.x, alien.y
+            size = alien.size
+            if y < shot_y + shot_length and y + size > shot_y and x - 5 < shot_x < x + size + 5:
+                if is_boss:
+                    alien.health -= 5
+                    if alien.health <= 0:
+                        alien.dead = True
+                        score += 500 * (2 if eagle_sweat_active else 1)
+                        flight_recorder.record("kill", kind="boss", by="buddy", x=x, y=y, score=score)
+                        kill_streak += 1
+                        highest_kill_streak = max(highest_kill_streak, kill_streak)
+                        if kill_streak == 5:
+                            player_health = min(PLAYER_MAX_HEALTH, player_health + 50)
+                        elif kill_streak == 10:
+                            shot_cooldown = max(5, shot_cooldown - 2)
+                        elif kill_streak == 15:
+                            score += 1000
+                            spawn_power_up(player_x, player_y)
+                        spawn_power_up(x, y)
+                        if boss_level:
+                            level += 1
+                            flight_recorder.record("level", level=level, score=score, reason="boss_kill")
+                            if level >= 10 and not dual_blasts:
+                                player_size = large_player_size
+                                player_frames = assets.get("player_large")
+                                player_x = WIDTH // 2 - player_size // 2
+                                player_dx = 0
+                                player_dy = 0
+                                player_angle = 90
+                                dual_blasts = True
+                            aliens.clear()
+                            projectiles.clear()
+                            power_ups.clear()
+                            generate_background(level)
+                            if level_up_sound: level_up_sound.play()
+                            if level % 5 == 0 and boss_types:
+                                spawn_alien()
+                            level_up_text = [title_font.render(f"Level {level}", True, WHITE), WIDTH // 2, HEIGHT // 2, 255, level_up_duration]
+                            spawn_interval = 15
+                else:
+                    alien.dead = True
+                    score += 10 * (2 if eagle_sweat_active else 1)
+                    flight_recorder.record("kill", kind=alien.kind, by="buddy", x=x, y=y, score=score)
+                    kill_streak += 1
+                    highest_kill_streak = max(highest_kill_streak, kill_streak)
+                    if kill_streak == 5:
+                        player_health = min(PLAYER_MAX_HEALTH, player_health + 50)
+                    elif kill_streak == 10:
+                        shot_cooldown = max(5, shot_cooldown - 2)
+                    elif kill_streak == 15:
+                        score += 1000
+                        spawn_power_up(player_x, player_y)
+                    spawn_power_up(x, y)
+                if hit_sound: hit_sound.play()
+                projectiles.kill(b_shot)
+                break
+
+    # Only one box to test against, so a straight scan beats building a grid for it
+    meteors = planet_surface.meteors if planet_surface else []
+    contacts = [body for body in aliens + meteors
+                if body.y + body.size > player_y and body.y < player_y + player_size and body.x + body.size > player_x and body.x < player_x + player_size]
+
+    for meteor in contacts:
+        if meteor.kind == "meteor":
+            player_health -= 25
+            if ship_hit_sound: ship_hit_sound.play()
+            meteor.dead = True
+
+    if not shield_active:
+        touching = None
+        for alien in contacts:
+            if alien.kind != "meteor":
+                touching = alien
+                player_health -= 50
+                capture_streak = 0
+                if ship_hit_sound: ship_hit_sound.play()
+                break
 
+        # Shot damage goes by the alien the contact check stopped on: the one touching the ship, else the last alien
+        last_alien = touching or (aliens[-1] if aliens else None)
+        shot_damage = BOSS_SHOT_DAMAGE if last_alien and last_alien.kind == "boss" else ENEMY_SHOT_DAMAGE
+        shot_box = (player_x - enemy_shot_width, player_y - enemy_shot_length, player_x + player_size + enemy_shot_width, player_y + player_size)
+        for e_shot in projectiles.select(ENEMY_SHOT, box=shot_box)[0]:
+            player_health -= shot_damage
+            capture_streak = 0
+            projectiles.kill(e_shot)
+            if ship_hit_sound: hit_sound.play()
+
+        if player_health <= 0:
+            divers_rescued -= 1
+            flight_recorder.record("diver_lost", divers=divers_rescued, level=level, score=score)
+            kill_streak = 0
+            capture_streak = 0
+            player_health = 200
+            player_x = WIDTH // 2 - player_size // 2
+            player_y = HEIGHT - 100
+            player_dx = 0
+            player_dy = 0
+            player_angle = 90
+            break_free_used = False
+            new_aliens = [alien for alien in aliens if alien.kind == "boss"]
+            aliens.clear()
+            aliens.extend(new_aliens)
+            projectiles.clear()
+            power_ups.clear()
+
+    for pu in power_ups:
+        pu_x, pu_y, pu_kind = pu.x, pu.y, pu.kind
+        if pu_y + power_up_size > player_y and pu_y < player_y + player_size and pu_x + power_up_size > player_x and pu_x < player_x + player_size:
+            pu.dead = True
+            capture_streak += 1
+            highest_capture_streak = max(highest_capture_streak, capture_streak)
+            if capture_streak == 3:
+                score += 100
+            elif capture_streak == 5:
+                spawn_power_up(player_x, player_y)
+            elif capture_streak == 10:
+                divers_rescued += 1
+            if power_up_sounds: fx_random.choice(power_up_sounds).play()
+            flight_recorder.record("pickup", power_up=pu_kind, x=pu_x, y=pu_y, capture_streak=capture_streak)
+            activate_power_up(pu_kind)
+
+    shot_timer = max(0, shot_timer - 1)
+    power_up_timers.run_due(frame_count)
+
+    if level_up_text:
+        text_surface, x, y, alpha, timer = level_up_text
+        y -= 2
+        alpha -= 255 // level_up_duration
+        timer -= 1
+        if timer <= 0 or alpha <= 0:
+            level_up_text = None
+        else:
+            level_up_text = [text_surface, x, y, max(0, alpha), timer]
+
+    compact_entities(aliens)
+    compact_entities(power_ups)
+    projectiles.compact()
+
+    if stars: stars.move()
+    if planet_surface: planet_surface.move()
+
+
+def render_game(alpha):
+    # alpha is how far the clock has run into the next step; moving things are drawn that far between
+    # their previous and current state. Shots and scrolling layers move linearly, so they step back by velocity.
+    back = alpha - 1
+
+    world.fill((10, 10, 20))  # Base layer, covered by PlanetSurface
+    if stars: stars.draw(world, alpha)
+    if planet_surface: planet_surface.draw(world, alpha)
+
+    draw_x = prev_player_x + (player_x - prev_player_x) * alpha
+    draw_y = prev_player_y + (player_y - prev_player_y) * alpha
+    rotated_player, half_w, half_h = rotated_sprite(player_frames[player_frame], player_angle - 90)
+    world.blits([glow_blit_item(draw_x, draw_y, player_size, RED if divers_rescued < 3 else WHITE),
+                 (rotated_player, ((int(draw_x) + player_size // 2) * RENDER_SCALE - half_w, (int(draw_y) + player_size // 2) * RENDER_SCALE - half_h))], doreturn=False)
+    if shield_active:
+        pygame.draw.rect(world, BLUE, world_rect(draw_x - 5, draw_y - 5, player_size + 10, player_size + 10), max(1, round(2 * RENDER_SCALE)))
+
+    if battle_buddy_active:
+        buddy_x = battle_buddy_x + draw_x - player_x  # The buddy rides alongside the player
+        buddy_y = battle_buddy_y + draw_y - player_y
+        world.blits([glow_blit_item(buddy_x, buddy_y, battle_buddy_size, NEON_GREEN),
+                     sprite_atlas.blit_item(battle_buddy_sprite, buddy_x, buddy_y)], doreturn=False)
+
+    glow_batch = []
+    sprite_batch = []
+    for alien in aliens:
+        x = alien.prev_x + (alien.x - alien.prev_x) * alpha
+        y = alien.prev_y + (alien.y - alien.prev_y) * alpha
+        frames, frame = alien.frames, alien.frame
+        size = alien.size
+        glow_batch.append(glow_blit_item(x, y, size, YELLOW, is_enemy=True))
+        if frame < len(frames):
+            sprite_batch.append(sprite_atlas.blit_item(frames[frame], x, y))
+    world.blits(glow_batch, doreturn=False)
+    world.blits(sprite_batch, doreturn=False)
+
+    projectile_batch = []
+    for owner, colors in ((PLAYER_SHOT, PLAYER_SHOT_COLORS), (BUDDY_SHOT, BUDDY_SHOT_COLORS)):
+        for _, shot_x, shot_y, dx, dy in zip(*projectiles.select(owner, "x", "y", "dx", "dy")):
+            trail, anchor_x, anchor_y = shot_trail_sprite(colors, dx, dy)
+            projectile_batch.append((trail, ((shot_x + dx * back) * RENDER_SCALE - anchor_x, (shot_y + dy * back) * RENDER_SCALE - anchor_y)))
+
+    glow_surf = enemy_shot_glow_sprite()
+    glow_anchor = enemy_shot_width * 3 * RENDER_SCALE
+    for _, e_x, e_y, dx, dy, lifetime in zip(*projectiles.select(ENEMY_SHOT, "x", "y", "dx", "dy", "lifetime")):
+        e_x = (e_x + dx * back) * RENDER_SCALE
+        e_y = (e_y + dy * back) * RENDER_SCALE
+        gradient_surf, anchor_x, anchor_y = enemy_shot_sprite(projectile_angle_index(dx, dy), enemy_shot_alpha_index(lifetime))
+        projectile_batch.append((gradient_surf, (int(e_x) - anchor_x, int(e_y) - anchor_y)))
+        projectile_batch.append((glow_surf, (e_x - glow_anchor, e_y - glow_anchor)))
+    world.blits(projectile_batch, doreturn=False)
+
+    glow_batch = []
+    sprite_batch = []
+    for pu in power_ups:
+        x = pu.prev_x + (pu.x - pu.prev_x) * alpha
+        y = pu.prev_y + (pu.y - pu.prev_y) * alpha
+        glow_batch.append(glow_blit_item(x, y, power_up_size, WHITE))
+        sprite_batch.append(sprite_atlas.blit_item(power_up_sprites[pu.kind], x, y))
+    world.blits(glow_batch, doreturn=False)
+    world.blits(sprite_batch, doreturn=False)
+
+    present_world()  # Everything below is HUD, drawn at full resolution
+
+    if level_up_text:
+        text_surface, x, y, text_alpha, _ = level_up_text
+        text_surface.set_alpha(text_alpha)
+        screen.blit(text_surface, text_surface.get_rect(center=(x, y)))
+
+    if eagle_sweat_active:
+        sweat_text = hud.label("Eagle Sweat Active!", YELLOW)
+        screen.blit(sweat_text, (WIDTH // 2 - sweat_text.get_width() // 2, HEIGHT - 30))
+    if battle_buddy_active:
+        buddy_text = hud.label("Battle Buddy Active!", NEON_GREEN)
+        screen.blit(buddy_text, (WIDTH // 2 - buddy_text.get_width() // 2, HEIGHT - 50))
+
+    boss = find_boss()
+    if boss:
+        screen.blit(hud.boss_panel(boss.health, level_difficulty(level, base_level)["boss_health"]), (WIDTH - 210, 10))
+
+    screen.blit(hud.stats_panel(score, high_score, divers_rescued, level, player_health, PLAYER_MAX_HEALTH, kill_streak,
+                                highest_kill_streak, capture_streak, highest_capture_streak), (0, 0))
+
+    pygame.display.flip()
+
+def break_free():
+    global break_free_used
+    if break_free_used:
+        return
+    break_free_used = True
+    if input_recorder: input_recorder.break_free.append(frame_count + 1)
+    boss = find_boss()
+    if boss:
+        dx = player_x + player_size // 2 - boss.x
+        dy = player_y + player_size // 2 - boss.y
+        dist = max(1, math.hypot(dx, dy))
+        push_force = 200
+        boss.x -= (dx / dist) * push_force
+        boss.y -= (dy / dist) * push_force
+        if boom_sound: boom_sound.play()
+
+def new_game():
+    global player_x, player_y, player_dx, player_dy, player_angle, score, aliens, projectiles, power_ups, spawn_timer, shot_timer, shot_cooldown, divers_rescued, double_shot, piercing_shot, trishot, quad_shot, burst_mode, shield_active, eagle_sweat_active, battle_buddy_active, battle_buddy_x, battle_buddy_y, battle_buddy_shot_timer, paused, player_frame, player_frame_timer, level_up_text, player_size, player_frames, dual_blasts, player_health, kill_streak, highest_kill_streak, capture_streak, highest_capture_streak, break_free_used, spawn_interval, frame_count, prev_player_x, prev_player_y
     player_x = WIDTH // 2 - player_size // 2
     player_y = HEIGHT - 100
     player_dx = 0
@@ -960,33 +2794,22 @@ def run_game():
     player_angle = 90
     score = 0
     aliens = []
-    shots = []
-    enemy_shots = []
+    projectiles = ProjectileStore()
     power_ups = []
-    battle_buddy_shots = []
     spawn_timer = 0
     spawn_interval = 15
     shot_timer = 0
     shot_cooldown = 15
     divers_rescued = 3
-    player_health = 200
-    PLAYER_MAX_HEALTH = 200
+    player_health = PLAYER_MAX_HEALTH
     double_shot = False
-    double_shot_timer = 0
     piercing_shot = False
-    piercing_shot_timer = 0
     trishot = False
-    trishot_timer = 0
     quad_shot = False
-    quad_shot_timer = 0
     burst_mode = False
-    burst_timer = 0
     shield_active = False
-    shield_timer = 0
     eagle_sweat_active = False
-    eagle_sweat_timer = 0
     battle_buddy_active = False
-    battle_buddy_timer = 0
     battle_buddy_x = player_x + player_size + 10
     battle_buddy_y = player_y - battle_buddy_size
     battle_buddy_shot_timer = 0
@@ -1000,70 +2823,66 @@ def run_game():
     capture_streak = 0
     highest_capture_streak = 0
     break_free_used = False
-    
+    bind_game_assets()
+
     if dual_blasts:
-        player_size = 60
-        player_frames = load_sprite_frames("dropship", 2, player_size, player_size, WHITE)
+        player_size = large_player_size
+        player_frames = assets.get("player_large")
         player_x = WIDTH // 2 - player_size // 2
-    
-    if level == 1 and first_level_1_start:
-        if not play_intro():
-            return False
-        first_level_1_start = False
+    prev_player_x, prev_player_y = player_x, player_y
+    power_up_timers.clear()
     
     generate_background(level)
     if level % 5 == 0 and boss_types:
         spawn_alien()
     frame_count = 0
 
+def run_game():
+    global paused, joystick, first_level_1_start, input_recorder
+   
+    if pygame.joystick.get_count() > 0 and not joystick:
+        joystick = pygame.joystick.Joystick(0)
+        joystick.init()
+
+    if level == 1 and first_level_1_start:
+        if not play_intro():
+            return False
+        first_level_1_start = False
+    if INPUT_RECORD_FILE:
+        input_recorder = InputRecorder(INPUT_RECORD_FILE, level)
+        random.seed(input_recorder.seed)
+    new_game()
+
+    previous_time = time.perf_counter()
+    accumulator = SIM_DT  # Simulate one step before the first frame is drawn
     running = True
     while running:
         if paused:
             result = pause_screen()
             if result is True:
                 paused = False
+                previous_time = time.perf_counter()  # Time spent in the pause menu is not simulated
                 continue
             elif result == "reset":
                 return True
             else:
                 return False
 
-        frame_count += 1
+        frame_start = time.perf_counter()
+        flight_recorder.begin_frame()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 return False
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_p:
                     paused = not paused
-                elif event.key == pygame.K_b and not break_free_used:
-                    break_free_used = True
-                    for alien in aliens:
-                        if len(alien) == 7:
-                            x, y = alien[0], alien[1]
-                            dx = player_x + player_size // 2 - x
-                            dy = player_y + player_size // 2 - y
-                            dist = max(1, math.hypot(dx, dy))
-                            push_force = 200
-                            alien[0] -= (dx / dist) * push_force
-                            alien[1] -= (dy / dist) * push_force
-                            if boom_sound: boom_sound.play()
-                            break
+                elif event.key == pygame.K_b:
+                    break_free()
             elif event.type == pygame.JOYBUTTONDOWN and joystick:
                 if joystick.get_button(4):
                     paused = not paused
-                elif joystick.get_button(3) and not break_free_used:
-                    break_free_used = True
-                    for alien in aliens:
-                        if len(alien) == 7:
-                            x, y = alien[0], alien[1]
-                            dx = player_x + player_size // 2 - x
-                            dy = player_y + player_size // 2 - y
-                            dist = max(1, math.hypot(dx, dy))
-                            push_force = 200
-                            alien[0] -= (dx / dist) * push_force
-                            alien[1] -= (dy / dist) * push_force
-                            if boom_sound: boom_sound.play()
-                            break
+                elif joystick.get_button(3):
+                    break_free()
             elif event.type == pygame.JOYDEVICEADDED:
                 if pygame.joystick.get_count() > 0 and not joystick:
                     joystick = pygame.joystick.Joystick(event.device_index)
@@ -1072,622 +2891,186 @@ def run_game():
         if divers_rescued <= 0:
             break
 
-        boss_level = level % 5 == 0
-        if not boss_level and score >= (level - base_level + 1) * BASE_THRESHOLD:
-            level += 1
-            if level >= 10 and not dual_blasts:
-                player_size = 60
-                player_frames = load_sprite_frames("dropship", 2, player_size, player_size, WHITE)
-                player_x = WIDTH // 2 - player_size // 2
-                player_dx = 0
-                player_dy = 0
-                player_angle = 90
-                dual_blasts = True
-            aliens.clear()
-            shots.clear()
-            enemy_shots.clear()
-            battle_buddy_shots.clear()
-            power_ups.clear()
-            generate_background(level)  # Single reset on level-up
-            if level_up_sound: level_up_sound.play()
-            if level % 5 == 0 and boss_types:
-                spawn_alien()
-            level_up_text = [title_font.render(f"Level {level}", True, WHITE), WIDTH // 2, HEIGHT // 2, 255, level_up_duration]
-            spawn_interval = 15
-
-        spawn_timer += 1
-        if spawn_timer >= spawn_interval:
-            if not boss_level:
-                spawn_alien()
-            elif boss_level and any(len(a) == 7 for a in aliens):
-                if random.random() < 0.1:
-                    x = random.randint(0, WIDTH - alien_size)
-                    roll = random.random()
-                    if roll < 0.33:
-                        aliens.append([x, 0, bug_frames, False, 0, 0])
-                    elif roll < 0.66:
-                        aliens.append([x, 0, bot_frames, False, 0, 0])
-                    else:
-                        aliens.append([x, 0, squid_frames, False, 0, 0])
-            spawn_timer = 0
-
-        if joystick:
-            x_axis = joystick.get_axis(0)
-            y_axis = joystick.get_axis(1)
-            if abs(x_axis) > 0.1:
-                player_dx += x_axis * 0.5
-                player_dx = max(-player_speed, min(player_speed, player_dx))
-            if abs(y_axis) > 0.1:
-                player_dy += y_axis * 0.5
-                player_dy = max(-player_speed, min(player_speed, player_dy))
-
-            rot_axis = joystick.get_axis(2)
-            if abs(rot_axis) > 0.1:
-                player_angle += rot_axis * 2
-
-            player_x += player_dx
-            player_y += player_dy
-            player_dx *= 0.95
-            player_dy *= 0.95
-            player_x = max(0, min(WIDTH - player_size, player_x))
-            player_y = max(0, min(HEIGHT - player_size, player_y))
-
-            r2_value = (joystick.get_axis(5) + 1) / 2
-            fire_active = r2_value > 0.5
-        else:
-            keys = pygame.key.get_pressed()
-            if keys[pygame.K_LEFT]:
-                player_dx -= 0.5
-                player_dx = max(-player_speed, min(player_speed, player_dx))
-            if keys[pygame.K_RIGHT]:
-                player_dx += 0.5
-                player_dx = max(-player_speed, min(player_speed, player_dx))
-            if keys[pygame.K_UP]:
-                player_dy -= 0.5
-                player_dy = max(-player_speed, min(player_speed, player_dy))
-            if keys[pygame.K_DOWN]:
-                player_dy += 0.5
-                player_dy = max(-player_speed, min(player_speed, player_dy))
-
-            player_x += player_dx
-            player_y += player_dy
-            player_dx *= 0.95
-            player_dy *= 0.95
-            player_x = max(0, min(WIDTH - player_size, player_x))
-            player_y = max(0, min(HEIGHT - player_size, player_y))
-
-            fire_active = keys[pygame.K_SPACE]
-
-        if fire_active and shot_timer <= 0:
-            angle_rad = math.radians(player_angle)
-            shot_dx = math.cos(angle_rad) * shot_speed
-            shot_dy = math.sin(angle_rad) * shot_speed
-            shot_x = player_x + player_size // 2 - math.cos(angle_rad) * (player_size // 2)
-            shot_y = player_y + player_size // 2 - math.sin(angle_rad) * (player_size // 2)
-            if burst_mode:
-                shots.append([shot_x, shot_y, piercing_shot, shot_dx, shot_dy])
-                shot_timer = 1
-            elif quad_shot:
-                for offset in [-15, -5, 5, 15]:
-                    offset_rad = math.radians(player_angle + offset)
-                    shots.append([shot_x, shot_y, piercing_shot, math.cos(offset_rad) * shot_speed, math.sin(offset_rad) * shot_speed])
-                shot_timer = shot_cooldown
-            elif trishot:
-                for offset in [-10, 0, 10]:
-                    offset_rad = math.radians(player_angle + offset)
-                    shots.append([shot_x, shot_y, piercing_shot, math.cos(offset_rad) * shot_speed, math.sin(offset_rad) * shot_speed])
-                shot_timer = shot_cooldown
-            elif double_shot or dual_blasts:
-                for offset in [-5, 5]:
-                    offset_rad = math.radians(player_angle + offset)
-                    shots.append([shot_x, shot_y, piercing_shot, math.cos(offset_rad) * shot_speed, math.sin(offset_rad) * shot_speed])
-                shot_timer = shot_cooldown
-            else:
-                shots.append([shot_x, shot_y, piercing_shot, shot_dx, shot_dy])
-                shot_timer = shot_cooldown
-            if shoot_sound: shoot_sound.play()
-
-        player_frame_timer += 1
-        if player_frame_timer >= player_frame_speed:
-            player_frame_timer = 0
-            player_frame = (player_frame + 1) % len(player_frames)
-
-        if battle_buddy_active:
-            battle_buddy_x = player_x + player_size + 10
-            battle_buddy_y = player_y - battle_buddy_size
-            battle_buddy_timer -= 1
-            if battle_buddy_timer <= 0:
-                battle_buddy_active = False
-                battle_buddy_shots.clear()
-
-            battle_buddy_shot_timer -= 1
-            if battle_buddy_shot_timer <= 0 and aliens:
-                nearest_alien = min(aliens, key=lambda a: math.hypot(a[0] - battle_buddy_x, a[1] - battle_buddy_y))
-                if nearest_alien:
-                    dx = nearest_alien[0] - battle_buddy_x
-                    dy = nearest_alien[1] - battle_buddy_y
-                    dist = max(1, math.hypot(dx, dy))
-                    battle_buddy_shots.append([battle_buddy_x + battle_buddy_size // 2, battle_buddy_y, shot_speed * dx / dist, shot_speed * dy / dist])
-                    if shoot_sound: shoot_sound.play()
-                battle_buddy_shot_timer = battle_buddy_shot_cooldown
-
-        aliens_to_remove = []
-        shots_to_remove = []
-        shots_to_add = []
-        enemy_shots_to_remove = []
-        battle_buddy_shots_to_remove = []
-        power_ups_to_remove = []
-
-        for alien in aliens:
-            is_boss = len(alien) == 7
-            x, y = alien[0], alien[1]
-            frames, is_special, frame, frame_timer = alien[2], alien[3], alien[-2], alien[-1]
-            size = boss_size if is_boss else alien_size
-            speed = alien_speed
-            shot_chance = enemy_shot_chance
-            if is_boss:
-                _, speed, shot_chance = get_boss_difficulty(level, base_level)
-            elif is_special:
-                speed = hunter_speed
-
-            if is_boss or is_special:
-                dx = player_x + player_size // 2 - x
-                dy = player_y + player_size // 2 - y
-                dist = max(1, math.hypot(dx, dy))
-                alien[0] += speed * dx / dist
-                alien[1] += speed * dy / dist
-                if hunter_thrust_sound and random.random() < 0.05 and not is_boss: hunter_thrust_sound.play()
-            else:
-                alien[1] += speed
-
-            if alien[1] > HEIGHT:
-                aliens_to_remove.append(alien)
-
-            if random.random() < shot_chance and frame_count > 60:
-                if is_boss:
-                    center_x, center_y = x + size // 2, y + size // 2
-                    for i in range(6):
-                        angle = math.radians(i * 60 + frame_count % 360)
-                        speed_variation = enemy_shot_speed * (1 + random.uniform(0, 0.5))
-                        enemy_shots.append([center_x, center_y, speed_variation * math.cos(angle), speed_variation * math.sin(angle), 120])
-                elif not is_special:
-                    enemy_shots.append([x + size // 2, y + size, 0, enemy_shot_speed, 120])
-
-            alien[-1] += 1
-            if alien[-1] >= (boss_frame_speed if is_boss else alien_frame_speed):
-                alien[-1] = 0
-                alien[-2] = (alien[-2] + 1) % len(frames)
-
-        for shot in shots:
-            shot[0] += shot[3]
-            shot[1] += shot[4]
-            if shot[1] < -shot_length or shot[1] > HEIGHT or shot[0] < 0 or shot[0] > WIDTH:
-                shots_to_remove.append(shot)
-
-        for b_shot in battle_buddy_shots:
-            b_shot[0] += b_shot[2]
-            b_shot[1] += b_shot[3]
-            if b_shot[1] < -shot_length or b_shot[1] > HEIGHT or b_shot[0] < 0 or b_shot[0] > WIDTH:
-                battle_buddy_shots_to_remove.append(b_shot)
-
-        for e_shot in enemy_shots:
-            e_shot[0] += e_shot[2]
-            e_shot[1] += e_shot[3]
-            e_shot[4] -= 1
-            if e_shot[4] <= 0 or e_shot[1] > HEIGHT or e_shot[0] < 0 or e_shot[0] > WIDTH:
-                enemy_shots_to_remove.append(e_shot)
-
-        for pu in power_ups:
-            pu_x, pu_y = pu[0], pu[1]
-            if piercing_shot:
-                dx = player_x + player_size // 2 - pu_x
-                dy = player_y + player_size // 2 - pu_y
-                dist = max(1, math.hypot(dx, dy))
-                pu[0] += 3 * dx / dist
-                pu[1] += 3 * dy / dist
-            else:
-                pu[1] += 3
-            if pu[1] > HEIGHT:
-                power_ups_to_remove.append(pu)
-                capture_streak = 0
-
-        for shot in shots:
-            shot_x, shot_y, piercing = shot[:3]
-            for alien in aliens:
-                if alien in aliens_to_remove:
-                    continue
-                is_boss = len(alien) == 7
-                x, y = alien[0], alien[1]
-                size = boss_size if is_boss else alien_size
-                if y < shot_y + shot_length and y + size > shot_y and x - 5 < shot_x < x + size + 5:
-                    if is_boss:
-                        alien[4] -= 5
-                        if alien[4] <= 0:
-                            aliens_to_remove.append(alien)
-                            score += 500 * (2 if eagle_sweat_active else 1)
-                            kill_streak += 1
-                            highest_kill_streak = max(highest_kill_streak, kill_streak)
-                            if kill_streak == 5:
-                                player_health = min(PLAYER_MAX_HEALTH, player_health + 50)
-                            elif kill_streak == 10:
-                                shot_cooldown = max(5, shot_cooldown - 2)
-                            elif kill_streak == 15:
-                                score += 1000
-                                spawn_power_up(player_x, player_y)
-                            spawn_power_up(x, y)
-                            if boss_level:
-                                level += 1
-                                if level >= 10 and not dual_blasts:
-                                    player_size = 60
-                                    player_frames = load_sprite_frames("dropship", 2, player_size, player_size, WHITE)
-                                    player_x = WIDTH // 2 - player_size // 2
-                                    player_dx = 0
-                                    player_dy = 0
-                                    player_angle = 90
-                                    dual_blasts = True
-                                aliens.clear()
-                                shots.clear()
-                                enemy_shots.clear()
-                                battle_buddy_shots.clear()
-                                power_ups.clear()
-                                generate_background(level)
-                                if level_up_sound: level_up_sound.play()
-                                if level % 5 == 0 and boss_types:
-                                    spawn_alien()
-                                level_up_text = [title_font.render(f"Level {level}", True, WHITE), WIDTH // 2, HEIGHT // 2, 255, level_up_duration]
-                                spawn_interval = 15
-                    else:
-                        aliens_to_remove.append(alien)
-                        score += 10 * (2 if eagle_sweat_active else 1)
-                        kill_streak += 1
-                        highest_kill_streak = max(highest_kill_streak, kill_streak)
-                        if kill_streak == 5:
-                            player_health = min(PLAYER_MAX_HEALTH, player_health + 50)
-                        elif kill_streak == 10:
-                            shot_cooldown = max(5, shot_cooldown - 2)
-                        elif kill_streak == 15:
-                            score += 1000
-                            spawn_power_up(player_x, player_y)
-                        spawn_power_up(x, y)
-                    if hit_sound: hit_sound.play()
-                    if piercing and random.random() < 0.5:
-                        shots_to_add.extend([[shot_x, shot_y, False, offset, shot_speed] for offset in [-5, 5]])
-                    if not piercing:
-                        shots_to_remove.append(shot)
-                    break
-
-        for b_shot in battle_buddy_shots:
-            shot_x, shot_y = b_shot[0], b_shot[1]
-            for alien in aliens:
-                if alien in aliens_to_remove:
-                    continue
-                is_boss = len(alien) == 7
-                x, y = alien[0], alien[1]
-                size = boss_size if is_boss else alien_size
-                if y < shot_y + shot_length and y + size > shot_y and x - 5 < shot_x < x + size + 5:
-                    if is_boss:
-                        alien[4] -= 5
-                        if alien[4] <= 0:
-                            aliens_to_remove.append(alien)
-                            score += 500 * (2 if eagle_sweat_active else 1)
-                            kill_streak += 1
-                            highest_kill_streak = max(highest_kill_streak, kill_streak)
-                            if kill_streak == 5:
-                                player_health = min(PLAYER_MAX_HEALTH, player_health + 50)
-                            elif kill_streak == 10:
-                                shot_cooldown = max(5, shot_cooldown - 2)
-                            elif kill_streak == 15:
-                                score += 1000
-                                spawn_power_up(player_x, player_y)
-                            spawn_power_up(x, y)
-                            if boss_level:
-                                level += 1
-                                if level >= 10 and not dual_blasts:
-                                    player_size = 60
-                                    player_frames = load_sprite_frames("dropship", 2, player_size, player_size, WHITE)
-                                    player_x = WIDTH // 2 - player_size // 2
-                                    player_dx = 0
-                                    player_dy = 0
-                                    player_angle = 90
-                                    dual_blasts = True
-                                aliens.clear()
-                                shots.clear()
-                                enemy_shots.clear()
-                                battle_buddy_shots.clear()
-                                power_ups.clear()
-                                generate_background(level)
-                                if level_up_sound: level_up_sound.play()
-                                if level % 5 == 0 and boss_types:
-                                    spawn_alien()
-                                level_up_text = [title_font.render(f"Level {level}", True, WHITE), WIDTH // 2, HEIGHT // 2, 255, level_up_duration]
-                                spawn_interval = 15
-                    else:
-                        aliens_to_remove.append(alien)
-                        score += 10 * (2 if eagle_sweat_active else 1)
-                        kill_streak += 1
-                        highest_kill_streak = max(highest_kill_streak, kill_streak)
-                        if kill_streak == 5:
-                            player_health = min(PLAYER_MAX_HEALTH, player_health + 50)
-                        elif kill_streak == 10:
-                            shot_cooldown = max(5, shot_cooldown - 2)
-                        elif kill_streak == 15:
-                            score += 1000
-                            spawn_power_up(player_x, player_y)
-                        spawn_power_up(x, y)
-                    if hit_sound: hit_sound.play()
-                    battle_buddy_shots_to_remove.append(b_shot)
-                    break
-
-        if not shield_active:
-            for alien in aliens:
-                is_boss = len(alien) == 7
-                a_x, a_y = alien[0], alien[1]
-                size = boss_size if is_boss else alien_size
-                if a_y + size > player_y and a_y < player_y + player_size and a_x + size > player_x and a_x < player_x + player_size:
-                    player_health -= 50
-                    capture_streak = 0
-                    if ship_hit_sound: ship_hit_sound.play()
-                    break
-            
-            for e_shot in enemy_shots:
-                e_x, e_y = e_shot[0], e_shot[1]
-                if e_y + enemy_shot_length > player_y and e_y < player_y + player_size and e_x - enemy_shot_width < player_x + player_size and e_x + enemy_shot_width > player_x:
-                    player_health -= 35 if not len(alien) == 7 else 25
-                    capture_streak = 0
-                    enemy_shots_to_remove.append(e_shot)
-                    if ship_hit_sound: hit_sound.play()
-
-            if player_health <= 0:
-                divers_rescued -= 1
-                kill_streak = 0
-                capture_streak = 0
-                player_health = 200
-                player_x = WIDTH // 2 - player_size // 2
-                player_y = HEIGHT - 100
-                player_dx = 0
-                player_dy = 0
-                player_angle = 90
-                break_free_used = False
-                new_aliens = [alien for alien in aliens if len(alien) == 7]
-                aliens.clear()
-                aliens.extend(new_aliens)
-                shots.clear()
-                enemy_shots.clear()
-                battle_buddy_shots.clear()
-                power_ups.clear()
-
-        for pu in power_ups:
-            pu_x, pu_y, pu_sprite = pu
-            if pu_y + power_up_size > player_y and pu_y < player_y + player_size and pu_x + power_up_size > player_x and pu_x < player_x + player_size:
-                power_ups_to_remove.append(pu)
-                capture_streak += 1
-                highest_capture_streak = max(highest_capture_streak, capture_streak)
-                if capture_streak == 3:
-                    score += 100
-                elif capture_streak == 5:
-                    spawn_power_up(player_x, player_y)
-                elif capture_streak == 10:
-                    divers_rescued += 1
-                if power_up_sounds: random.choice(power_up_sounds).play()
-                if pu_sprite == power_up_sprites["rate"]:
-                    shot_cooldown = max(10, shot_cooldown - 5)
-                elif pu_sprite == power_up_sprites["reinforce"]:
-                    player_health = min(PLAYER_MAX_HEALTH, player_health + 100)
-                elif pu_sprite == power_up_sprites["diver_pod"]:
-                    divers_rescued += 1
-                elif pu_sprite == power_up_sprites["resupply"]:
-                    double_shot = True
-                    double_shot_timer = 300
-                elif pu_sprite == power_up_sprites["hellbomb"]:
-                    score += len(aliens) * 50 * (2 if eagle_sweat_active else 1)
-                    aliens.clear()
-                    enemy_shots.clear()
-                    battle_buddy_shots.clear()
-                    power_ups.clear()
-                    if boom_sound: boom_sound.play()
-                    if boss_level:
-                        level += 1
-                        if level >= 10 and not dual_blasts:
-                            player_size = 60
-                            player_frames = load_sprite_frames("dropship", 2, player_size, player_size, WHITE)
-                            player_x = WIDTH // 2 - player_size // 2
-                            player_dx = 0
-                            player_dy = 0
-                            player_angle = 90
-                            dual_blasts = True
-                        aliens.clear()
-                        shots.clear()
-                        enemy_shots.clear()
-                        battle_buddy_shots.clear()
-                        power_ups.clear()
-                        generate_background(level)
-                        if level_up_sound: level_up_sound.play()
-                        if level % 5 == 0 and boss_types:
-                            spawn_alien()
-                        level_up_text = [title_font.render(f"Level {level}", True, WHITE), WIDTH // 2, HEIGHT // 2, 255, level_up_duration]
-                        spawn_interval = 15
-                elif pu_sprite == power_up_sprites["mg94"]:
-                    shot_cooldown = 5
-                elif pu_sprite == power_up_sprites["eat17"]:
-                    piercing_shot = True
-                    piercing_shot_timer = 300
-                elif pu_sprite == power_up_sprites["shield"]:
-                    shield_active = True
-                    shield_timer = 300
-                elif pu_sprite == power_up_sprites["trishot"]:
-                    trishot = True
-                    trishot_timer = 300
-                elif pu_sprite == power_up_sprites["quad"]:
-                    quad_shot = True
-                    quad_shot_timer = 300
-                elif pu_sprite == power_up_sprites["burst"]:
-                    burst_mode = True
-                    burst_timer = 300
-                elif pu_sprite == power_up_sprites["eagle_sweat"]:
-                    eagle_sweat_active = True
-                    eagle_sweat_timer = 600
-                    if eagle_sweat_sound: eagle_sweat_sound.play()
-                elif pu_sprite == power_up_sprites["battle_buddy"]:
-                    battle_buddy_active = True
-                    battle_buddy_timer = 1800
-                    battle_buddy_shot_timer = battle_buddy_shot_cooldown
-                    if battle_buddy_sound: battle_buddy_sound.play()
-
-        shot_timer = max(0, shot_timer - 1)
-        if double_shot_timer > 0:
-            double_shot_timer -= 1
-            if double_shot_timer <= 0: double_shot = False
-        if piercing_shot_timer > 0:
-            piercing_shot_timer -= 1
-            if piercing_shot_timer <= 0: piercing_shot = False
-        if trishot_timer > 0:
-            trishot_timer -= 1
-            if trishot_timer <= 0: trishot = False
-        if quad_shot_timer > 0:
-            quad_shot_timer -= 1
-            if quad_shot_timer <= 0: quad_shot = False
-        if burst_timer > 0:
-            burst_timer -= 1
-            if burst_timer <= 0: burst_mode = False
-        if shield_timer > 0:
-            shield_timer -= 1
-            if shield_timer <= 0: shield_active = False
-        if eagle_sweat_timer > 0:
-            eagle_sweat_timer -= 1
-            if eagle_sweat_timer <= 0: eagle_sweat_active = False
-
-        if level_up_text:
-            text_surface, x, y, alpha, timer = level_up_text
-            y -= 2
-            alpha -= 255 // level_up_duration
-            timer -= 1
-            if timer <= 0 or alpha <= 0:
-                level_up_text = None
-            else:
-                level_up_text = [text_surface, x, y, max(0, alpha), timer]
-
-        for lst, to_remove in [(aliens, aliens_to_remove), (shots, shots_to_remove), 
-                               (enemy_shots, enemy_shots_to_remove), (battle_buddy_shots, battle_buddy_shots_to_remove), 
-                               (power_ups, power_ups_to_remove)]:
-            for item in to_remove:
-                if item in lst: lst.remove(item)
-        shots.extend(shots_to_add)
-
-        for star in stars: star.move()
-        if planet_surface: planet_surface.move()
-
-        screen.fill((10, 10, 20))  # Base layer, covered by PlanetSurface
-        for star in stars: star.draw(screen)
-        if planet_surface: planet_surface.draw(screen)
-
-        rotated_player = pygame.transform.rotate(player_frames[player_frame], player_angle - 90)
-        player_rect = rotated_player.get_rect(center=(player_x + player_size // 2, player_y + player_size // 2))
-        draw_glow(screen, player_x, player_y, player_size, RED if divers_rescued < 3 else WHITE)
-        screen.blit(rotated_player, player_rect.topleft)
-        if shield_active:
-            pygame.draw.rect(screen, BLUE, (player_x - 5, player_y - 5, player_size + 10, player_size + 10), 2)
-
-        if battle_buddy_active:
-            draw_glow(screen, battle_buddy_x, battle_buddy_y, battle_buddy_size, NEON_GREEN)
-            screen.blit(battle_buddy_sprite, (battle_buddy_x, battle_buddy_y))
-
-        for alien in aliens:
-            x, y, frames, _, frame = alien[0], alien[1], alien[2], alien[3], alien[-2]
-            size = boss_size if len(alien) == 7 else alien_size
-            draw_glow(screen, x, y, size, YELLOW, is_enemy=True)
-            if frame < len(frames):
-                screen.blit(frames[frame], (x, y))
-
-        for shot in shots:
-            shot_x, shot_y, _, dx, dy = shot
-            pygame.draw.line(screen, YELLOW, (shot_x, shot_y), (shot_x + dx * 0.5, shot_y + dy * 0.5), shot_width)
-            pygame.draw.line(screen, ORANGE, (shot_x + dx * 0.5, shot_y + dy * 0.5), (shot_x + dx, shot_y + dy), shot_width - 1)
-
-        for b_shot in battle_buddy_shots:
-            shot_x, shot_y, dx, dy = b_shot
-            pygame.draw.line(screen, NEON_GREEN, (shot_x, shot_y), (shot_x + dx * 0.5, shot_y + dy * 0.5), shot_width)
-            pygame.draw.line(screen, CYAN, (shot_x + dx * 0.5, shot_y + dy * 0.5), (shot_x + dx, shot_y + dy), shot_width - 1)
-
-        for e_shot in enemy_shots:
-            e_x, e_y, dx, dy, lifetime = e_shot
-            end_x = e_x + dx * enemy_shot_length / enemy_shot_speed
-            end_y = e_y + dy * enemy_shot_length / enemy_shot_speed
-            gradient_surf = pygame.Surface((enemy_shot_length * 2, enemy_shot_width * 3), pygame.SRCALPHA)
-            for i in range(enemy_shot_length):
-                alpha = int(255 * (lifetime / 120) * (1 - i / enemy_shot_length))
-                pygame.draw.line(gradient_surf, (255, 0, 0, alpha), (i * 2, 0), (i * 2, enemy_shot_width * 3))
-                if i > enemy_shot_length // 4 and i < enemy_shot_length * 3 // 4:
-                    core_alpha = int(255 * (lifetime / 120))
-                    pygame.draw.line(gradient_surf, (255, 255, 255, core_alpha), (i * 2, enemy_shot_width), (i * 2, enemy_shot_width * 2))
-            angle = math.degrees(math.atan2(dy, dx))
-            gradient_surf = pygame.transform.rotate(gradient_surf, -angle)
-            screen.blit(gradient_surf, gradient_surf.get_rect(center=(e_x, e_y)).topleft)
-            glow_surf = pygame.Surface((enemy_shot_width * 6, enemy_shot_width * 6), pygame.SRCALPHA)
-            pygame.draw.circle(glow_surf, (255, 0, 0, 100), (enemy_shot_width * 3, enemy_shot_width * 3), enemy_shot_width * 3)
-            screen.blit(glow_surf, (e_x - enemy_shot_width * 3, e_y - enemy_shot_width * 3))
-
-        for pu in power_ups:
-            draw_glow(screen, pu[0], pu[1], power_up_size, WHITE)
-            screen.blit(pu[2], (pu[0], pu[1]))
-
-        if level_up_text:
-            text_surface, x, y, alpha, _ = level_up_text
-            text_surface.set_alpha(alpha)
-            screen.blit(text_surface, text_surface.get_rect(center=(x, y)))
-
-        if eagle_sweat_active:
-            sweat_text = font.render("Eagle Sweat Active!", True, YELLOW)
-            screen.blit(sweat_text, (WIDTH // 2 - sweat_text.get_width() // 2, HEIGHT - 30))
-        if battle_buddy_active:
-            buddy_text = font.render("Battle Buddy Active!", True, NEON_GREEN)
-            screen.blit(buddy_text, (WIDTH // 2 - buddy_text.get_width() // 2, HEIGHT - 50))
-
-        for alien in aliens:
-            if len(alien) == 7:
-                health = alien[4]
-                max_health, _, _ = get_boss_difficulty(level, base_level)
-                pygame.draw.rect(screen, RED, (WIDTH - 210, 10, 200, 20))
-                pygame.draw.rect(screen, GREEN, (WIDTH - 210, 10, 200 * (health / max_health), 20))
-                screen.blit(font.render(f"Boss HP: {health}/{max_health}", True, WHITE), (WIDTH - 210, 35))
-                break
-
-        screen.blit(font.render(f"Points: {score}", True, WHITE), (10, 10))
-        screen.blit(font.render(f"High: {high_score}", True, WHITE), (10, 40))
-        screen.blit(font.render(f"Divers Rescued: {divers_rescued}", True, WHITE), (10, 70))
-        screen.blit(font.render(f"Level: {level}", True, WHITE), (10, 100))
-        pygame.draw.rect(screen, RED, (10, 130, 100, 10))
-        pygame.draw.rect(screen, GREEN, (10, 130, 100 * (player_health / PLAYER_MAX_HEALTH), 10))
-        screen.blit(font.render(f"HP: {player_health}/{PLAYER_MAX_HEALTH}", True, WHITE), (10, 145))
-        screen.blit(font.render(f"Kill Streak: {kill_streak}", True, WHITE), (10, 175))
-        screen.blit(font.render(f"Best Streak: {highest_kill_streak}", True, WHITE), (10, 205))
-        screen.blit(font.render(f"Capture Streak: {capture_streak}", True, WHITE), (10, 235))
-        screen.blit(font.render(f"Best Capture: {highest_capture_streak}", True, WHITE), (10, 265))
-
-        pygame.display.flip()
-        clock.tick(60)
+        accumulator += frame_start - previous_time
+        previous_time = frame_start
+        steps = 0
+        while accumulator >= SIM_DT and steps < MAX_SIM_STEPS and divers_rescued > 0:
+            update_game()
+            accumulator -= SIM_DT
+            steps += 1
+        if steps == MAX_SIM_STEPS:
+            accumulator = min(accumulator, SIM_DT)  # Drop the backlog instead of spiralling; the game slows down here
+
+        render_game(min(1.0, accumulator / SIM_DT))
+        flight_recorder.end_frame((time.perf_counter() - frame_start) * 1000, aliens=len(aliens), shots=projectiles.live(PLAYER_SHOT),
+                                  enemy_shots=projectiles.live(ENEMY_SHOT), power_ups=len(power_ups), steps=steps)
+        clock.tick(MAX_FPS)
 
     if divers_rescued <= 0:
         if music_enabled: pygame.mixer.music.stop()
         return game_over_screen(score, kill_streak, highest_kill_streak, capture_streak, highest_capture_streak)
     return False
 
-game_active = True
-generate_background(level)
-while game_active:
-    try:
-        if start_screen():
-            game_result = run_game()
-            if game_result is True:
-                continue
+INPUT_RECORD_FILE = os.environ.get("EAGLE_STRIKE_RECORD_INPUTS", "")
+INPUT_KEYS = {"left": pygame.K_LEFT, "right": pygame.K_RIGHT, "up": pygame.K_UP, "down": pygame.K_DOWN, "fire": pygame.K_SPACE}
+HEADLESS_STEPS = SIM_HZ * 600
+
+class ScriptedKeys:
+    def __init__(self):
+        self.held = set()
+
+    def __getitem__(self, key):
+        return key in self.held
+
+class InputScript:
+    # {"seed": n, "level": n, "inputs": [[step, ["left", "fire"]], ...], "break_free": [step, ...], "repeat": n}
+    # Keys stay held until the next entry; with "repeat" the inputs start over every that many steps.
+    def __init__(self, inputs, break_free=(), repeat=0, seed=None, level=None):
+        self.inputs = sorted((int(step), tuple(names)) for step, names in inputs)
+        for step, names in self.inputs:
+            for name in names:
+                if name not in INPUT_KEYS:
+                    raise ValueError(f"Unknown input '{name}' at step {step}")
+        self.steps = [step for step, names in self.inputs]
+        self.break_free = set(break_free)
+        self.repeat = repeat
+        self.seed = seed
+        self.level = level
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r") as f:
+            data = json.load(f)
+        return cls(data.get("inputs", []), data.get("break_free", []), data.get("repeat", 0), data.get("seed"), data.get("level"))
+
+    def keys_at(self, step):
+        if self.repeat:
+            step = (step - 1) % self.repeat + 1
+        i = bisect.bisect_right(self.steps, step) - 1
+        return {INPUT_KEYS[name] for name in self.inputs[i][1]} if i >= 0 else set()
+
+def strafing_script():
+    # Fire the whole time while sweeping side to side and up and down
+    inputs = [[step, ["fire", "left" if step // 40 % 2 == 0 else "right", "up" if step // 70 % 2 == 0 else "down"]] for step in range(0, 560, 10)]
+    return InputScript(inputs, break_free=[300], repeat=560)
+
+class InputRecorder:
+    def __init__(self, path, level):
+        self.path = path
+        self.level = level
+        self.seed = random.getrandbits(32)
+        self.inputs = []
+        self.break_free = []
+        self.held = None
+
+    def sample(self, step, keys):
+        held = [name for name, key in INPUT_KEYS.items() if keys[key]]
+        if held != self.held:
+            self.inputs.append([step, held])
+            self.held = held
+
+    def save(self):
+        try:
+            with open(self.path, "w") as f:
+                json.dump({"seed": self.seed, "level": self.level, "inputs": self.inputs, "break_free": self.break_free}, f)
+            log(f"Recorded {len(self.inputs)} input changes to {self.path}")
+        except Exception as e:
+            log(f"Failed to save inputs to {self.path}: {e}", LOG_ERROR, every=1)
+
+def run_headless(steps, script, seed=None, start_level=None):
+    global level, base_level, scripted_keys
+    start_level = start_level or script.level or 1
+    seed = seed if seed is not None else script.seed if script.seed is not None else random.getrandbits(32)
+    log(f"Headless run: {steps} steps from Level {start_level}, seed {seed}")
+    random.seed(seed)
+    scripted_keys = ScriptedKeys()
+    level = base_level = start_level
+    new_game()
+    games = 1
+    start = time.perf_counter()
+    for _ in range(steps):
+        if divers_rescued <= 0:
+            log(f"Headless game {games} over at Level {level} with {score} points")
+            level = base_level = start_level
+            new_game()
+            games += 1
+        step_start = time.perf_counter()
+        flight_recorder.begin_frame()
+        if frame_count + 1 in script.break_free:
+            break_free()
+        scripted_keys.held = script.keys_at(frame_count + 1)
+        update_game()
+        flight_recorder.end_frame((time.perf_counter() - step_start) * 1000, aliens=len(aliens), shots=projectiles.live(PLAYER_SHOT),
+                                  enemy_shots=projectiles.live(ENEMY_SHOT), power_ups=len(power_ups), steps=1)
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    report = (f"Simulated {steps} frames ({steps / SIM_HZ:.0f}s of play, {games} game(s), last at Level {level} with {score} points) "
+              f"in {elapsed:.2f}s: {steps / elapsed:.0f} frames/s, {steps / elapsed / SIM_HZ:.1f}x real time")
+    log(report)
+    print(report)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Eagle Strike v1.1")
+    parser.add_argument("--headless", action="store_true", help="simulate without drawing or sound as fast as the CPU allows")
+    parser.add_argument("--steps", type=int, default=HEADLESS_STEPS, help=f"frames to simulate in headless mode, {SIM_HZ} per second of play")
+    parser.add_argument("--level", type=int, choices=range(1, LEVEL_COUNT + 1), metavar=f"1-{LEVEL_COUNT}", help="starting level in headless mode")
+    parser.add_argument("--seed", type=int, help="random seed for headless mode")
+    parser.add_argument("--inputs", help="input script or EAGLE_STRIKE_RECORD_INPUTS recording to play in headless mode")
+    return parser.parse_args()
+
+def main():
+    global high_score
+    args = parse_args()
+    if args.headless:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        os.environ["SDL_AUDIODRIVER"] = "dummy"
+    log("Starting Eagle Strike...")
+    init_pygame()
+    queue_assets()
+    if not args.headless:
+        init_music()
+    high_score = load_high_score()
+    load_difficulty()
+    update_volumes()
+
+    failed = False
+    if args.headless:
+        try:
+            script = InputScript.load(args.inputs) if args.inputs else strafing_script()
+            bind_game_assets()
+            run_headless(args.steps, script, args.seed, args.level)
+        except Exception as e:
+            log(f"Headless run error: {e}\n{traceback.format_exc()}", LOG_ERROR)
+            flight_recorder.dump("crash", detail=traceback.format_exc())
+            failed = True
+        game_active = False
+    else:
+        game_active = True
+        generate_background(level)
+    while game_active:
+        try:
+            if start_screen():
+                game_result = run_game()
+                if input_recorder: input_recorder.save()
+                if game_result is True:
+                    continue
+                else:
+                    game_active = False
             else:
                 game_active = False
-        else:
+        except Exception as e:
+            log(f"Main loop error: {e}\n{traceback.format_exc()}", LOG_ERROR)
+            flight_recorder.dump("crash", detail=traceback.format_exc())
             game_active = False
-    except Exception as e:
-        log(f"Main loop error: {e}")
-        game_active = False
 
-log("Exiting Eagle Strike...")
-if music_enabled: pygame.mixer.music.stop()
-pygame.joystick.quit()
-pygame.quit()
\ No newline at end of file
+    log("Exiting Eagle Strike...")
+    flight_recorder.dump("quit")
+    assets.shutdown()
+    if music_enabled: pygame.mixer.music.stop()
+    pygame.joystick.quit()
+    pygame.quit()
+    stop_logging()
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
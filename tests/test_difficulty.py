@@ -0,0 +1,53 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import eagle_strike  # noqa: E402
+
+
+@pytest.fixture
+def difficulty_dir(tmp_path, monkeypatch):
+    logged = []
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(eagle_strike, "log", lambda message, level=eagle_strike.LOG_INFO, every=0: logged.append((level, message)))
+    yield tmp_path, logged
+    eagle_strike.build_difficulty_table(dict(eagle_strike.DIFFICULTY_DEFAULTS))
+
+
+def write_difficulty(path, overrides):
+    (path / eagle_strike.DIFFICULTY_FILE).write_text(json.dumps(overrides))
+
+
+def default_table():
+    eagle_strike.build_difficulty_table(dict(eagle_strike.DIFFICULTY_DEFAULTS))
+    return dict(eagle_strike.difficulty_table)
+
+
+@pytest.mark.parametrize("overrides", [
+    {"levels": []},
+    {"levels": {"7": 5}},
+    {"wave_odds": 5},
+    {"boss_health_base": None},
+    {"score_per_level": "x"},
+])
+def test_bad_shapes_fall_back_to_defaults(difficulty_dir, overrides):
+    path, logged = difficulty_dir
+    expected = default_table()
+    write_difficulty(path, overrides)
+    eagle_strike.load_difficulty()
+    assert eagle_strike.difficulty_settings == eagle_strike.DIFFICULTY_DEFAULTS
+    assert eagle_strike.difficulty_table == expected
+    assert any(level == eagle_strike.LOG_WARNING and "using the defaults" in message for level, message in logged)
+    assert eagle_strike.level_difficulty(2, 1)["score_threshold"] == 2 * eagle_strike.BASE_THRESHOLD
+
+
+def test_overrides_apply(difficulty_dir):
+    path, logged = difficulty_dir
+    write_difficulty(path, {"enemy_shot_chance": 0.02, "levels": {"7": {"boss_speed_base": 4}}})
+    eagle_strike.load_difficulty()
+    assert eagle_strike.level_difficulty(3, 1)["enemy_shot_chance"] == 0.02
+    assert eagle_strike.level_difficulty(7, 1)["boss_speed"] == 4 + eagle_strike.DIFFICULTY_DEFAULTS["boss_speed_per_encounter"]
+    assert not any(level == eagle_strike.LOG_WARNING for level, message in logged)